@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+
+# Функции открытия сжатых файлов по расширению (для записи) и по сигнатуре (для чтения)
+OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+_SIGNATURES = ((b'\x1f\x8b', gzip.open), (b'BZh', bz2.open), (b'\xfd7zXZ\x00', lzma.open))
+
+
+def compression_opener(filename, mode='r'):
+    """
+    Возвращает функцию открытия для сжатого файла (gzip.open, bz2.open, lzma.open)
+    или None для обычного файла. Существующий файл при чтении распознаётся по сигнатуре,
+    новый файл при записи — по расширению.
+    """
+    if 'r' in mode and os.path.exists(filename):
+        with open(filename, 'rb') as file:
+            head = file.read(6)
+        for signature, opener in _SIGNATURES:
+            if head.startswith(signature):
+                return opener
+        return None
+    return OPENERS.get(os.path.splitext(filename)[1].lower())
+
+
+def open_text(filename, mode='r'):
+    """Открывает файл графа в текстовом режиме, сжатый файл распаковывается/сжимается потоково."""
+    opener = compression_opener(filename, mode)
+    if opener is None:
+        return open(filename, mode)
+    return opener(filename, mode + 't')
+
+
+@contextmanager
+def open_lines(filename):
+    """
+    Контекст с итерируемыми строками файла графа. Сжатый файл распаковывается
+    в отдельном потоке (ReadAhead) параллельно с разбором строк.
+    """
+    if compression_opener(filename) is None:
+        with open(filename, 'r') as file:
+            yield file
+    else:
+        with open_text(filename) as file, ReadAhead(file) as lines:
+            yield lines
+
+
+@contextmanager
+def atomic_text_writer(filename):
+    """
+    Открывает для записи текста временный файл рядом с filename (сжатие выбирается
+    по расширению filename). После успешной записи данные сбрасываются на диск
+    и временный файл атомарно подменяет filename; при ошибке временный файл удаляется,
+    а прежнее содержимое filename остаётся нетронутым.
+    """
+    opener = compression_opener(filename, 'w')
+    temp_name = filename + '.tmp'
+    try:
+        with open(temp_name, 'wb') as raw:
+            # Обёртка не должна закрывать raw: он нужен для fsync
+            file = io.TextIOWrapper(raw) if opener is None else opener(raw, 'wt')
+            try:
+                yield file
+            finally:
+                if opener is None:
+                    file.flush()
+                    file.detach()
+                else:
+                    file.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_name, filename)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+
+
+class ReadAhead:
+    """
+    Чтение строк файла в отдельном потоке: пока вызывающий код разбирает очередную пачку
+    строк, поток уже распаковывает следующие (zlib, bz2 и lzma отпускают GIL).
+    Используется как контекстный менеджер, чтобы поток завершался и при ошибке разбора.
+    """
+
+    def __init__(self, file, batch_size=1 << 16, depth=8):
+        self._file = file
+        self.batch_size = batch_size  # Примерный размер пачки в символах (подсказка для readlines)
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                batch = self._file.readlines(self.batch_size)
+                self._put(batch)
+                if not batch:
+                    return
+        except Exception as error:
+            self._put(error)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self):
+        while True:
+            batch = self._queue.get()
+            if isinstance(batch, Exception):
+                raise batch
+            if not batch:
+                return
+            yield from batch
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,436 @@
+from array import array
+from collections import deque
+from collections.abc import Mapping
+import heapq
+import mmap
+import os
+import struct
+import sys
+
+# Бинарный формат снимка CSR: заголовок, таблица имён вершин (UTF-8, разделитель '\n'),
+# затем массивы offsets (int64), indegrees (int64), targets (int32/int64) и weights (float64).
+# Каждый раздел выровнен на 8 байт, массивы записаны в порядке байтов машины, сохранившей файл.
+BINARY_MAGIC = b'GRAPHCSR'
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct('<8sIIQQQ')  # Сигнатура, версия, флаги, вершины, рёбра, размер таблицы имён
+_FLAG_DIRECTED = 1
+_FLAG_WEIGHTED = 2
+_FLAG_WIDE_TARGETS = 4  # targets хранятся как int64
+_FLAG_BIG_ENDIAN = 8
+
+
+def _typecode(buffer):
+    """Код типа элементов для array.array и memoryview."""
+    return getattr(buffer, 'typecode', None) or buffer.format
+
+
+def _padding(size):
+    return -size % 8
+
+
+class CSRGraph:
+    """
+    Компактное представление графа в формате CSR (Compressed Sparse Row).
+
+    Имена вершин заменяются плотными целыми индексами, а рёбра хранятся
+    в непрерывных массивах: соседи вершины i лежат в targets[offsets[i]:offsets[i + 1]],
+    их веса — в weights по тем же позициям. Для невзвешенного графа weights равен None.
+    """
+
+    def __init__(self, names, offsets, targets, weights=None, directed=False):
+        self.names = names  # Индекс -> имя вершины
+        self.index = {name: i for i, name in enumerate(names)}  # Имя вершины -> индекс
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        self.indegrees = None  # Полустепени захода (вычисляются по запросу или читаются из снимка)
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list, directed=False, weighted=False):
+        names = list(adjacency_list)
+        index = {name: i for i, name in enumerate(names)}
+        offsets = array('q', [0])
+        targets = array('i' if len(names) < 2 ** 31 else 'q')
+        weights = array('d') if weighted else None
+
+        for name in names:
+            for neighbor, weight in adjacency_list[name].items():
+                targets.append(index[neighbor])
+                if weighted:
+                    weights.append(weight)
+            offsets.append(len(targets))
+
+        return cls(names, offsets, targets, weights, directed)
+
+    @property
+    def weighted(self):
+        return self.weights is not None
+
+    def vertex_count(self):
+        return len(self.names)
+
+    def edge_count(self):
+        return len(self.targets)
+
+    def nbytes(self):
+        """Объём памяти массивов CSR и таблиц индексов (без строк с именами вершин)."""
+        total = sum(buffer.itemsize * len(buffer) for buffer in (self.offsets, self.targets))
+        if self.weights is not None:
+            total += self.weights.itemsize * len(self.weights)
+        return total + sys.getsizeof(self.names) + sys.getsizeof(self.index)
+
+    def in_degrees(self):
+        """Массив полустепеней захода вершин по индексам."""
+        if self.indegrees is None:
+            indegrees = array('q', [0]) * len(self.names)
+            for v in self.targets:
+                indegrees[v] += 1
+            self.indegrees = indegrees
+        return self.indegrees
+
+    def neighbors(self, i):
+        """Возвращает пары (индекс соседа, вес) для вершины с индексом i."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        if self.weights is None:
+            return [(self.targets[k], 1) for k in range(start, end)]
+        return list(zip(self.targets[start:end], self.weights[start:end]))
+
+    def to_numpy(self):
+        """
+        Возвращает массивы offsets/targets/weights как массивы NumPy без копирования данных.
+        """
+        import numpy as np
+
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        targets = np.frombuffer(self.targets, dtype=np.int32 if _typecode(self.targets) == 'i' else np.int64)
+        weights = np.frombuffer(self.weights, dtype=np.float64) if self.weights is not None else None
+        return offsets, targets, weights
+
+    def to_adjacency(self):
+        """Восстанавливает словарь смежности с именами вершин."""
+        names = self.names
+        return {names[i]: {names[v]: w if self.weighted else None for v, w in self.neighbors(i)}
+                for i in range(len(names))}
+
+    def save_binary(self, filename):
+        """
+        Сохраняет CSR-массивы в бинарный файл снимка. Имена вершин записываются как строки.
+        Файл пишется во временный и затем атомарно подменяет старый: старый файл
+        может быть отображён в память графом, загруженным из него.
+        """
+        names = [str(name) for name in self.names]
+        if any('\n' in name for name in names):
+            raise ValueError("Имя вершины не может содержать перевод строки")
+        name_table = '\n'.join(names).encode('utf-8')
+        indegrees = self.in_degrees()
+        wide = _typecode(self.targets) != 'i'
+
+        flags = 0
+        if self.directed:
+            flags |= _FLAG_DIRECTED
+        if self.weighted:
+            flags |= _FLAG_WEIGHTED
+        if wide:
+            flags |= _FLAG_WIDE_TARGETS
+        if sys.byteorder == 'big':
+            flags |= _FLAG_BIG_ENDIAN
+
+        temp_name = filename + '.tmp'
+        with open(temp_name, 'wb') as file:
+            file.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags,
+                                           len(self.names), len(self.targets), len(name_table)))
+            file.write(name_table)
+            file.write(bytes(_padding(len(name_table))))
+            file.write(self.offsets)
+            file.write(indegrees)
+            file.write(self.targets)
+            file.write(bytes(_padding(len(self.targets) * (8 if wide else 4))))
+            if self.weights is not None:
+                file.write(self.weights)
+        os.replace(temp_name, filename)
+
+    @classmethod
+    def load_binary(cls, filename):
+        """
+        Открывает бинарный снимок через mmap. Массивы offsets/targets/weights — это
+        представления memoryview над отображённым файлом без копирования: страницы
+        читаются с диска по мере обращения. Декодируется только таблица имён.
+        """
+        with open(filename, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+
+        if len(view) < _BINARY_HEADER.size:
+            raise ValueError(f"Файл '{filename}' не является снимком графа")
+        magic, version, flags, n, m, names_size = _BINARY_HEADER.unpack_from(view)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"Файл '{filename}' не является снимком графа")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Неподдерживаемая версия снимка графа: {version}")
+        if bool(flags & _FLAG_BIG_ENDIAN) != (sys.byteorder == 'big'):
+            raise ValueError("Снимок графа сохранён на машине с другим порядком байтов")
+
+        target_size = 8 if flags & _FLAG_WIDE_TARGETS else 4
+        weighted = bool(flags & _FLAG_WEIGHTED)
+        position = _BINARY_HEADER.size
+
+        def section(size, typecode):
+            nonlocal position
+            part = view[position:position + size].cast(typecode)
+            position += size + _padding(size)
+            return part
+
+        name_table = bytes(view[position:position + names_size]).decode('utf-8')
+        position += names_size + _padding(names_size)
+        names = name_table.split('\n') if n else []
+
+        expected = position + (n + 1) * 8 + n * 8 + m * target_size + _padding(m * target_size)
+        if weighted:
+            expected += m * 8
+        if len(names) != n or len(view) < expected:
+            raise ValueError(f"Снимок графа '{filename}' повреждён")
+
+        offsets = section((n + 1) * 8, 'q')
+        indegrees = section(n * 8, 'q')
+        targets = section(m * target_size, 'q' if target_size == 8 else 'i')
+        weights = section(m * 8, 'd') if weighted else None
+
+        csr = cls(names, offsets, targets, weights, directed=bool(flags & _FLAG_DIRECTED))
+        csr.indegrees = indegrees
+        csr._buffer = buffer  # Отображение должно жить, пока живут представления массивов
+        return csr
+
+    def _require(self, name):
+        if name not in self.index:
+            raise KeyError(name)
+        return self.index[name]
+
+    def dijkstra(self, start):
+        n = len(self.names)
+        s = self._require(start)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        distances = [float('inf')] * n
+        distances[s] = 0
+        predecessors = [[] for _ in range(n)]
+        priority_queue = [(0, s)]
+
+        while priority_queue:
+            current_distance, u = heapq.heappop(priority_queue)
+
+            if current_distance > distances[u]:
+                continue
+
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                distance = current_distance + (weights[k] if weights is not None else 1)
+
+                if distance < distances[v]:
+                    distances[v] = distance
+                    heapq.heappush(priority_queue, (distance, v))
+                    predecessors[v] = [u]
+                elif distance == distances[v]:
+                    predecessors[v].append(u)
+
+        names = self.names
+        return ({names[i]: distances[i] for i in range(n)},
+                {names[i]: [names[p] for p in predecessors[i]] for i in range(n)})
+
+    def bfs_eccentricity(self, start):
+        n = len(self.names)
+        s = self._require(start)
+        offsets, targets = self.offsets, self.targets
+        distances = array('q', [-1]) * n
+        distances[s] = 0
+        queue = deque([s])
+        reached = 1
+
+        while queue:
+            u = queue.popleft()
+            next_distance = distances[u] + 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if distances[v] == -1:
+                    distances[v] = next_distance
+                    reached += 1
+                    queue.append(v)
+
+        if reached < n:
+            return float('inf')
+        return max(distances)
+
+    def find_connected_components(self):
+        n = len(self.names)
+        offsets, targets, names = self.offsets, self.targets, self.names
+        visited = bytearray(n)
+        components = []
+
+        for s in range(n):
+            if visited[s]:
+                continue
+            visited[s] = 1
+            queue = deque([s])
+            component = []
+            while queue:
+                u = queue.popleft()
+                component.append(names[u])
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if not visited[v]:
+                        visited[v] = 1
+                        queue.append(v)
+            components.append(component)
+
+        return components
+
+    def kruskal_mst(self):
+        n = len(self.names)
+        offsets, targets, weights, names = self.offsets, self.targets, self.weights, self.names
+
+        # Каждое неориентированное ребро берём один раз — со стороны вершины с меньшим индексом
+        edges = [(weights[k], u, targets[k])
+                 for u in range(n)
+                 for k in range(offsets[u], offsets[u + 1])
+                 if targets[k] >= u]
+        edges.sort(key=lambda x: x[0])
+
+        parent = array('q', range(n))
+        rank = bytearray(n)
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        mst = []
+        for weight, u, v in edges:
+            root_u, root_v = find(u), find(v)
+            if root_u != root_v:
+                mst.append((names[u], names[v], weight))
+                if rank[root_u] < rank[root_v]:
+                    root_u, root_v = root_v, root_u
+                parent[root_v] = root_u
+                if rank[root_u] == rank[root_v]:
+                    rank[root_u] += 1
+
+        return mst
+
+    def bellman_ford(self, start):
+        n = len(self.names)
+        s = self._require(start)
+        offsets, targets, weights, names = self.offsets, self.targets, self.weights, self.names
+        distances = [float('inf')] * n
+        predecessors = array('q', [-1]) * n
+        distances[s] = 0
+
+        def weight_at(k):
+            return weights[k] if weights is not None else 1
+
+        # Релаксация на месте, как в словарном варианте Graph: расстояние до u перечитывается
+        # для каждого ребра, поэтому петля отрицательного веса действует уже в этом же проходе
+        for _ in range(n - 1):
+            changed = False
+            for u in range(n):
+                if distances[u] == float('inf'):
+                    continue
+                for k in range(offsets[u], offsets[u + 1]):
+                    v = targets[k]
+                    if distances[u] + weight_at(k) < distances[v]:
+                        distances[v] = distances[u] + weight_at(k)
+                        predecessors[v] = u
+                        changed = True
+            if not changed:
+                break  # Расстояния больше не меняются, следующие проходы ничего не изменят
+
+        negative_cycles = []
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if distances[u] + weight_at(k) < distances[v]:
+                    # Восстанавливаем отрицательный цикл
+                    cycle = []
+                    current = v
+                    visited = set()
+                    while current != -1 and current not in visited:
+                        visited.add(current)
+                        cycle.append(names[current])
+                        current = predecessors[current]
+                    if current != -1:
+                        cycle.append(names[current])
+                    cycle.reverse()
+                    negative_cycles.append(cycle)
+        return negative_cycles
+
+    def edmonds_karp_max_flow(self, source, sink):
+        n = len(self.names)
+        s, t = self._require(source), self._require(sink)
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        # Остаточные ёмкости: для каждой вершины словарь индекс соседа -> ёмкость
+        residual_capacity = [{} for _ in range(n)]
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                residual_capacity[u][v] = weights[k] if weights is not None else 1
+                residual_capacity[v].setdefault(u, 0)  # Обратное ребро с нулевой ёмкостью
+
+        max_flow = 0
+        while True:
+            parent = array('q', [-1]) * n
+            parent[s] = s
+            queue = deque([s])
+            while queue and parent[t] == -1:
+                u = queue.popleft()
+                for v, capacity in residual_capacity[u].items():
+                    if parent[v] == -1 and capacity > 0:
+                        parent[v] = u
+                        queue.append(v)
+            if parent[t] == -1:
+                break
+
+            # Минимальная пропускная способность вдоль пути
+            path_flow = float('Inf')
+            v = t
+            while v != s:
+                u = parent[v]
+                path_flow = min(path_flow, residual_capacity[u][v])
+                v = u
+            v = t
+            while v != s:
+                u = parent[v]
+                residual_capacity[u][v] -= path_flow
+                residual_capacity[v][u] += path_flow
+                v = u
+            max_flow += path_flow
+        return max_flow
+
+
+class CSRAdjacencyView(Mapping):
+    """
+    Представление CSR-графа в виде словаря смежности только для чтения.
+    Словари соседей строятся по запросу, поэтому код, работающий с adjacency_list,
+    продолжает работать и с замороженным графом.
+    """
+
+    def __init__(self, csr):
+        self._csr = csr
+
+    def __getitem__(self, name):
+        csr = self._csr
+        i = csr.index[name]
+        names = csr.names
+        if csr.weighted:
+            return {names[v]: w for v, w in csr.neighbors(i)}
+        return {names[v]: None for v, _ in csr.neighbors(i)}
+
+    def __contains__(self, name):
+        return name in self._csr.index
+
+    def __iter__(self):
+        return iter(self._csr.names)
+
+    def __len__(self):
+        return len(self._csr.names)
@@ -0,0 +1,83 @@
+from bisect import bisect_left, insort
+
+
+class DegreeIndex:
+    """
+    Индекс степеней вершин: счётчик степени для каждой вершины и корзины вершин
+    по степени с отсортированным списком непустых степеней.
+    """
+
+    def __init__(self, vertices=()):
+        self.degrees = {}  # Вершина -> степень
+        self.buckets = {}  # Степень -> упорядоченное множество вершин ({вершина: None})
+        self.sorted_degrees = []  # Отсортированный список степеней с непустыми корзинами
+        for vertex in vertices:
+            self.add(vertex)
+
+    def _bucket_add(self, vertex, degree):
+        bucket = self.buckets.get(degree)
+        if bucket is None:
+            bucket = self.buckets[degree] = {}
+            insort(self.sorted_degrees, degree)
+        bucket[vertex] = None
+
+    def _bucket_remove(self, vertex, degree):
+        bucket = self.buckets[degree]
+        del bucket[vertex]
+        if not bucket:
+            del self.buckets[degree]
+            del self.sorted_degrees[bisect_left(self.sorted_degrees, degree)]
+
+    def copy(self):
+        clone = DegreeIndex()
+        clone.degrees = dict(self.degrees)
+        clone.buckets = {degree: dict(bucket) for degree, bucket in self.buckets.items()}
+        clone.sorted_degrees = list(self.sorted_degrees)
+        return clone
+
+    def __contains__(self, vertex):
+        return vertex in self.degrees
+
+    def __len__(self):
+        return len(self.degrees)
+
+    def degree(self, vertex):
+        return self.degrees[vertex]
+
+    def add(self, vertex, degree=0):
+        if vertex in self.degrees:
+            return
+        self.degrees[vertex] = degree
+        self._bucket_add(vertex, degree)
+
+    def remove(self, vertex):
+        degree = self.degrees.pop(vertex, None)
+        if degree is not None:
+            self._bucket_remove(vertex, degree)
+
+    def change(self, vertex, delta):
+        degree = self.degrees[vertex]
+        self._bucket_remove(vertex, degree)
+        self.degrees[vertex] = degree + delta
+        self._bucket_add(vertex, degree + delta)
+
+    def below(self, limit):
+        """Вершины со степенью строго меньше limit (по возрастанию степени)."""
+        result = []
+        for degree in self.sorted_degrees[:bisect_left(self.sorted_degrees, limit)]:
+            result.extend(self.buckets[degree])
+        return result
+
+    def top(self, k):
+        """k вершин с наибольшей степенью в виде пар (вершина, степень)."""
+        result = []
+        for degree in reversed(self.sorted_degrees):
+            for vertex in self.buckets[degree]:
+                if len(result) >= k:
+                    return result
+                result.append((vertex, degree))
+        return result
+
+    def histogram(self):
+        """Гистограмма степеней: степень -> количество вершин."""
+        return {degree: len(self.buckets[degree]) for degree in self.sorted_degrees}
@@ -0,0 +1,158 @@
+import csv
+import os
+
+from compressed_io import open_lines
+
+
+class WeightType:
+    """
+    Определение типа весов при потоковом чтении: 'int', если все веса записаны
+    целыми числами, иначе 'float'. Для невзвешенных данных тип равен None.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    def parse(self, text):
+        text = text.strip()
+        weight = float(text)
+        if self.value != 'float':
+            self.value = 'int' if text.lstrip('+-').isdigit() else 'float'
+        return weight
+
+
+def format_weight(weight, weight_type):
+    return str(int(weight)) if weight_type == 'int' else str(weight)
+
+
+def detect_weight_type(weights):
+    """Тип уже загруженных весов: 'int', если все они целые, иначе 'float'."""
+    return 'int' if all(float(weight).is_integer() for weight in weights) else 'float'
+
+
+def _column_index(column, header):
+    if column is None or isinstance(column, int):
+        return column
+    if header is None:
+        raise ValueError(f"Столбец '{column}' задан по имени, но в файле нет строки заголовка")
+    if column not in header:
+        raise ValueError(f"В заголовке нет столбца '{column}'")
+    return header.index(column)
+
+
+def csv_delimiter(filename):
+    """Разделитель по расширению: табуляция для .tsv/.tab, иначе запятая (без учёта сжатия)."""
+    name = filename
+    for extension in ('.gz', '.bz2', '.xz'):
+        if name.lower().endswith(extension):
+            name = name[:-len(extension)]
+    return '\t' if os.path.splitext(name)[1].lower() in ('.tsv', '.tab') else ','
+
+
+def read_csv_edges(filename, source=0, target=1, weight=None, delimiter=None, header=True):
+    """
+    Потоково читает список рёбер CSV/TSV. Столбцы задаются номерами или именами из строки
+    заголовка; weight=None — невзвешенный граф. Строки без приёмника задают обособленные вершины.
+    Возвращает (вершины, источники, приёмники, веса или None, тип весов).
+    """
+    weight_type = WeightType()
+    vertices = []
+    sources, targets = [], []
+    weights = [] if weight is not None else None
+
+    with open_lines(filename) as lines:
+        reader = csv.reader(lines, delimiter=delimiter or csv_delimiter(filename))
+        names = next(reader, None) if header else None
+        source, target, weight = (_column_index(column, names) for column in (source, target, weight))
+
+        for row in reader:
+            if not row or source >= len(row) or not row[source].strip():
+                continue
+            u = row[source].strip()
+            if target >= len(row) or not row[target].strip():
+                vertices.append(u)
+                continue
+            sources.append(u)
+            targets.append(row[target].strip())
+            if weights is not None:
+                if weight >= len(row) or not row[weight].strip():
+                    raise ValueError(f"Нет веса у ребра {u}-{row[target].strip()}")
+                weights.append(weight_type.parse(row[weight]))
+
+    return vertices, sources, targets, weights, weight_type.value
+
+
+def write_csv_edges(file, edges, weighted, weight_type=None, delimiter=',', header=True, isolated=()):
+    """
+    Записывает рёбра (u, v, вес) в CSV/TSV с необязательной строкой заголовка.
+    Обособленные вершины isolated записываются строками из одного поля.
+    """
+    writer = csv.writer(file, delimiter=delimiter, lineterminator='\n')
+    if header:
+        writer.writerow(['source', 'target', 'weight'] if weighted else ['source', 'target'])
+    if weighted:
+        writer.writerows((u, v, format_weight(w, weight_type)) for u, v, w in edges)
+    else:
+        writer.writerows((u, v) for u, v, _ in edges)
+    writer.writerows([vertex] for vertex in isolated)
+
+
+def read_matrix_market(filename):
+    """
+    Потоково читает файл Matrix Market в координатном формате. Вершины — номера строк
+    и столбцов (с единицы); symmetric задаёт неориентированный граф, pattern — невзвешенный.
+    Возвращает (directed, число вершин, источники, приёмники, веса или None, тип весов).
+    """
+    weight_type = WeightType()
+    with open_lines(filename) as lines:
+        lines = iter(lines)
+        banner = next(lines, '').lower().split()
+        if len(banner) < 5 or banner[0] != '%%matrixmarket' or banner[1] != 'matrix' or banner[2] != 'coordinate':
+            raise ValueError("Поддерживаются только файлы Matrix Market в координатном формате")
+        field, symmetry = banner[3], banner[4]
+        if field not in ('real', 'integer', 'pattern'):
+            raise ValueError(f"Неподдерживаемый тип значений Matrix Market: '{field}'")
+        if symmetry not in ('general', 'symmetric'):
+            raise ValueError(f"Неподдерживаемая симметрия Matrix Market: '{symmetry}'")
+
+        size = None
+        for line in lines:
+            if line.strip() and not line.startswith('%'):
+                size = line.split()
+                break
+        if size is None or len(size) < 3:
+            raise ValueError("В файле Matrix Market нет строки размеров")
+        vertex_count = max(int(size[0]), int(size[1]))
+
+        sources, targets = [], []
+        weights = [] if field != 'pattern' else None
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith('%'):
+                continue
+            sources.append(int(parts[0]))
+            targets.append(int(parts[1]))
+            if weights is not None:
+                weights.append(weight_type.parse(parts[2]))
+
+    return symmetry == 'general', vertex_count, sources, targets, weights, weight_type.value
+
+
+def write_matrix_market(file, vertex_count, edges, directed, weighted, weight_type=None):
+    """
+    Записывает рёбра (i, j, вес) с номерами вершин от единицы в формате Matrix Market.
+    Для неориентированного графа (symmetric) каждое ребро записывается в нижний треугольник.
+    """
+    field = 'pattern' if not weighted else ('integer' if weight_type == 'int' else 'real')
+    edges = list(edges)
+    file.write(f"%%MatrixMarket matrix coordinate {field} {'general' if directed else 'symmetric'}\n")
+    file.write(f"{vertex_count} {vertex_count} {len(edges)}\n")
+    batch = []
+    for i, j, weight in edges:
+        if not directed and i < j:
+            i, j = j, i
+        batch.append(f"{i} {j} {format_weight(weight, weight_type)}\n" if weighted else f"{i} {j}\n")
+        if len(batch) >= 8192:
+            file.write(''.join(batch))
+            batch.clear()
+    file.write(''.join(batch))
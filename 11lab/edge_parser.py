@@ -0,0 +1,82 @@
+from array import array
+import os
+
+
+def parse_header(line):
+    """Разбирает строку заголовка файла графа: возвращает (directed, weighted)."""
+    header = line.strip().lower().split()
+    if len(header) < 2:
+        raise ValueError("В первой строке файла должен быть указан тип графа")
+    return header[0] == 'directed', header[1] == 'weighted'
+
+
+def split_ranges(filename, start, chunks):
+    """
+    Делит файл начиная с позиции start на не более чем chunks диапазонов байтов,
+    границы которых совпадают с началами строк.
+    """
+    size = os.path.getsize(filename)
+    if start >= size:
+        return []
+    step = max(1, (size - start) // chunks)
+    bounds = [start]
+    with open(filename, 'rb') as file:
+        for k in range(1, chunks):
+            file.seek(start + k * step - 1)
+            file.readline()  # Дочитываем строку, на которую попала граница
+            position = min(file.tell(), size)
+            if position > bounds[-1]:
+                bounds.append(position)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def parse_chunk(task):
+    """
+    Разбирает диапазон байтов файла со строками рёбер. Выполняется в отдельном процессе.
+
+    Возвращает локальную таблицу имён вершин в порядке первого появления, массивы
+    локальных индексов концов рёбер, массив весов (None для невзвешенного графа)
+    и число прочитанных строк.
+    """
+    filename, start, end, weighted, encoding = task
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+
+    names = []
+    index = {}
+    sources = array('q')
+    targets = array('q')
+    weights = array('d') if weighted else None
+
+    lines = text.split('\n')
+    if lines and not lines[-1]:
+        lines.pop()
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+
+        u = parts[0]
+        i = index.get(u)
+        if i is None:
+            i = index[u] = len(names)
+            names.append(u)
+        if len(parts) == 1:
+            continue  # Обособленная вершина
+
+        v = parts[1]
+        j = index.get(v)
+        if j is None:
+            j = index[v] = len(names)
+            names.append(v)
+        if weighted:
+            if len(parts) < 3:
+                raise ValueError(f"Для взвешенного графа нужен вес ребра: '{line.strip()}'")
+            weights.append(float(parts[2]))
+        sources.append(i)
+        targets.append(j)
+
+    return names, sources, targets, weights, len(lines)
@@ -1,121 +1,865 @@
 from disjoint_set import DisjointSet
+from csr import CSRGraph, CSRAdjacencyView
+from degree_index import DegreeIndex
+from result_cache import ResultCache
+from landmarks import Landmarks
+from edge_parser import parse_header, split_ranges, parse_chunk
+from compressed_io import compression_opener, open_lines, atomic_text_writer
+from mutation_log import MutationLog, read_log
+from edge_formats import (read_csv_edges, write_csv_edges, read_matrix_market, write_matrix_market,
+                          csv_delimiter, detect_weight_type)
 from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 import heapq
+import itertools
+import locale
+import os
+import sys
+import time
+
+# Общий счётчик версий: номер версии уникален среди всех графов и их снимков,
+# поэтому результат, вычисленный для версии, однозначно соответствует содержимому графа
+_version_counter = itertools.count(1)
+
 
 class Graph:
-    def __init__(self, directed=False, adjacency_list=None, weighted=False):
+    def __init__(self, directed=False, adjacency_list=None, weighted=False, track_incoming=True,
+                 journal_size=None, cache_size=32, tree_cache_size=8, cache_max_size=None):
         if adjacency_list is None:
             self.adjacency_list = {}
         else:
-            self.adjacency_list = {v: list(adj) for v, adj in adjacency_list.items()}
+            # Соседи вершины хранятся в словаре сосед -> вес: проверка, замена и удаление ребра за O(1),
+            # а порядок вставки (и значит порядок edges() и save_to_file) сохраняется
+            self.adjacency_list = {u: self._as_neighbor_dict(adj) for u, adj in adjacency_list.items()}
         self.directed = directed
         self.weighted = weighted  # Атрибут для определения взвешенности графа
+        self._csr = None  # Компактное CSR-представление (заполняется методом freeze)
+        # Обратные списки смежности (входящая вершина -> вес) для ориентированного графа.
+        # Для неориентированного графа входящие соседи совпадают с исходящими.
+        self.track_incoming = track_incoming
+        self.reverse_adjacency = None
+        # Индексы полустепеней исхода и захода (для неориентированного графа это один и тот же индекс)
+        self.out_degree_index = None
+        self.in_degree_index = None
+        self._rebuild_indexes()
+        # Версия графа увеличивается при каждом изменении; журнал хранит последние journal_size изменений
+        self.version = next(_version_counter)
+        self.journal = deque(maxlen=journal_size) if journal_size else None
+        self._journal_floor = self.version  # Изменения до этой версии в журнале уже не представлены
+        # Кэш результатов алгоритмов по ключу (алгоритм, аргументы, версия графа): не больше cache_size
+        # записей и, если задано, не больше cache_max_size суммарного размера (см. estimate_size)
+        self.result_cache = ResultCache(max_entries=cache_size, max_size=cache_max_size)
+        # Последние деревья кратчайших путей (расстояния и предшественники) по вершине-источнику
+        self.tree_cache = ResultCache(max_entries=tree_cache_size)
+        self._tree_cache_version = self.version
+        self._partial_tree_sources = set()  # Источники с частичным поиском при текущей версии (_shortest_path_dag)
+        # Журнал изменений на диске рядом с основным файлом графа (см. attach_log)
+        self.mutation_log = None
+        self.log_base = None
+
+    def _record(self, operation, *args):
+        """Присваивает графу новую версию и записывает изменение в журнал."""
+        self.version = next(_version_counter)
+        # Результаты прежних версий больше не понадобятся: у каждого графа свой кэш (см. copy)
+        if len(self.result_cache):
+            self.result_cache.clear()
+        if self.journal is not None:
+            if len(self.journal) == self.journal.maxlen:
+                self._journal_floor = self.journal[0][0]
+            self.journal.append((self.version, operation) + args)
+        if self.mutation_log is not None:
+            if operation == 'reset':
+                self.detach_log()  # Граф заменён целиком, журнал к нему больше не относится
+            else:
+                self.mutation_log.append(operation, args)
+
+    def _cached(self, algorithm, args, compute):
+        """
+        Возвращает результат алгоритма для текущей версии графа из кэша или вычисляет его.
+        Результаты из кэша общие, их нельзя изменять.
+        """
+        return self.result_cache.get_or_compute((algorithm, args, self.version), compute)
+
+    def cache_info(self):
+        """Статистика кэша результатов: попадания, промахи, вытеснения, число записей."""
+        return self.result_cache.info()
+
+    def changes_since(self, version):
+        """
+        Возвращает записи журнала (версия, операция, *аргументы), сделанные после указанной версии.
+        Возвращает None, если журнал отключён или часть изменений уже вытеснена из него —
+        в этом случае результат, вычисленный для старой версии, нужно пересчитать целиком.
+        Запись с операцией 'reset' означает, что граф был полностью заменён (загрузка из файла).
+        """
+        if version == self.version:
+            return []
+        if self.journal is None or version < self._journal_floor:
+            return None
+        return [record for record in self.journal if record[0] > version]
+
+    def _rebuild_indexes(self):
+        # Все структуры построены заново и принадлежат только этому графу
+        self._shared = False
+        self._owned_rows = None
+        self._owned_reverse_rows = None
+        self._rebuild_reverse_adjacency()
+        self._rebuild_degree_index()
+
+    def copy(self):
+        """
+        Создаёт снимок графа за O(1) по принципу копирования при записи (copy-on-write).
+        Снимок и исходный граф разделяют все структуры; при первом изменении в любом из них
+        копируются только внешние словари и словари соседей тех вершин, которые изменяются.
+        """
+        self._mark_shared()
+        snapshot = Graph.__new__(Graph)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot._mark_shared()
+        snapshot.result_cache = self.result_cache.copy()  # Результаты текущей версии верны для обоих
+        snapshot.tree_cache = ResultCache(max_entries=self.tree_cache.max_entries)
+        snapshot._partial_tree_sources = set()
+        snapshot.mutation_log = None  # Изменения снимка не попадают в журнал исходного графа
+        snapshot.log_base = None
+        if self.journal is not None:
+            snapshot.journal = deque(self.journal, maxlen=self.journal.maxlen)
+        return snapshot
+
+    def _mark_shared(self):
+        self._shared = True
+        self._owned_rows = set()  # Вершины, словари соседей которых уже скопированы этим графом
+        self._owned_reverse_rows = set()
+
+    def _begin_write(self):
+        """Проверяет, что граф можно изменять, и отделяет структуры, общие со снимком."""
+        if not self._check_not_frozen():
+            return False
+        if self._shared:
+            self.adjacency_list = dict(self.adjacency_list)
+            if self.reverse_adjacency is not None:
+                self.reverse_adjacency = dict(self.reverse_adjacency)
+            self.out_degree_index = self.out_degree_index.copy()
+            self.in_degree_index = self.in_degree_index.copy() if self.directed else self.out_degree_index
+            self._shared = False
+        return True
+
+    def _row(self, vertex):
+        """Словарь соседей вершины, пригодный для изменения (копируется при первой записи после снимка)."""
+        neighbors = self.adjacency_list[vertex]
+        if self._owned_rows is not None and vertex not in self._owned_rows:
+            neighbors = self.adjacency_list[vertex] = dict(neighbors)
+            self._owned_rows.add(vertex)
+        return neighbors
+
+    def _reverse_row(self, vertex):
+        neighbors = self.reverse_adjacency[vertex]
+        if self._owned_reverse_rows is not None and vertex not in self._owned_reverse_rows:
+            neighbors = self.reverse_adjacency[vertex] = dict(neighbors)
+            self._owned_reverse_rows.add(vertex)
+        return neighbors
+
+    def _rebuild_reverse_adjacency(self):
+        if not (self.track_incoming and self.directed) or self._csr is not None:
+            self.reverse_adjacency = None
+            return
+        self.reverse_adjacency = {vertex: {} for vertex in self.adjacency_list}
+        for u, neighbors in self.adjacency_list.items():
+            for v, weight in neighbors.items():
+                self.reverse_adjacency[v][u] = weight
+
+    def in_neighbors(self, vertex):
+        """Возвращает словарь входящих соседей вершины (сосед -> вес)."""
+        if not self.directed:
+            return self.adjacency_list[vertex]
+        if self.reverse_adjacency is not None:
+            return self.reverse_adjacency[vertex]
+        if vertex not in self.adjacency_list:
+            raise KeyError(vertex)
+        return {u: neighbors[vertex] for u, neighbors in self.adjacency_list.items() if vertex in neighbors}
+
+    def _rebuild_degree_index(self):
+        if self._csr is not None:
+            self._rebuild_degree_index_from_csr()
+            return
+        self.out_degree_index = DegreeIndex()
+        indegrees = {vertex: 0 for vertex in self.adjacency_list}
+        for vertex, neighbors in self.adjacency_list.items():
+            self.out_degree_index.add(vertex, len(neighbors))
+            for neighbor in neighbors:
+                indegrees[neighbor] += 1
+
+        if self.directed:
+            self.in_degree_index = DegreeIndex()
+            for vertex, indegree in indegrees.items():
+                self.in_degree_index.add(vertex, indegree)
+        else:
+            self.in_degree_index = self.out_degree_index
+
+    def _rebuild_degree_index_from_csr(self):
+        # Степени берутся из массивов CSR без построения словарей соседей
+        csr = self._csr
+        offsets, names = csr.offsets, csr.names
+        self.out_degree_index = DegreeIndex()
+        for i, vertex in enumerate(names):
+            self.out_degree_index.add(vertex, offsets[i + 1] - offsets[i])
+
+        if self.directed:
+            self.in_degree_index = DegreeIndex()
+            for vertex, indegree in zip(names, csr.in_degrees()):
+                self.in_degree_index.add(vertex, indegree)
+        else:
+            self.in_degree_index = self.out_degree_index
+
+    def _degree_index(self, direction):
+        if direction == 'in':
+            return self.in_degree_index
+        if direction == 'out':
+            return self.out_degree_index
+        raise ValueError(f"Неизвестное направление степени: '{direction}'")
+
+    def in_degree(self, vertex):
+        return self.in_degree_index.degree(vertex)
+
+    def out_degree(self, vertex):
+        return self.out_degree_index.degree(vertex)
+
+    def vertices_with_degree_below(self, limit, direction='in'):
+        """Вершины, у которых полустепень захода ('in') или исхода ('out') меньше limit."""
+        return self._degree_index(direction).below(limit)
+
+    def top_by_degree(self, k, direction='out'):
+        """k вершин с наибольшей степенью: список пар (вершина, степень)."""
+        return self._degree_index(direction).top(k)
+
+    def degree_histogram(self, direction='in'):
+        """Гистограмма степеней: степень -> количество вершин."""
+        return self._degree_index(direction).histogram()
+
+    @staticmethod
+    def _as_neighbor_dict(adj):
+        if isinstance(adj, dict):
+            return dict(adj)
+        # Поддерживаем старый формат: список кортежей (сосед, вес) или (сосед,)
+        neighbors = {}
+        for edge in adj:
+            if isinstance(edge, tuple):
+                neighbors[edge[0]] = edge[1] if len(edge) > 1 else None
+            else:
+                neighbors[edge] = None
+        return neighbors
 
-    def to_networkx(self):
+    def to_csr(self):
+        """
+        Строит компактное CSR-представление графа: имена вершин заменяются целыми индексами,
+        рёбра хранятся в непрерывных массивах offsets/targets/weights.
+        """
+        if self._csr is not None:
+            return self._csr
+        return CSRGraph.from_adjacency(self.adjacency_list, directed=self.directed, weighted=self.weighted)
+
+    def freeze(self):
+        """
+        Переводит граф в режим только для чтения с CSR-хранилищем.
+        Списки смежности освобождаются, алгоритмы работают напрямую с CSR.
+        """
+        if self._csr is None:
+            self._csr = self.to_csr()
+            self.adjacency_list = CSRAdjacencyView(self._csr)
+            self.reverse_adjacency = None
+        return self._csr
+
+    def thaw(self):
+        """Возвращает граф из CSR-режима в обычный изменяемый список смежности."""
+        if self._csr is not None:
+            self.adjacency_list = self._csr.to_adjacency()
+            self._csr = None
+            self._rebuild_indexes()
+
+    @property
+    def frozen(self):
+        return self._csr is not None
+
+    def _check_not_frozen(self):
+        if self._csr is not None:
+            print("Ошибка: Граф заморожен. Вызовите thaw() перед изменением.")
+            return False
+        return True
+
+    def memory_usage(self):
+        """
+        Оценивает память, занятую хранением рёбер (без строк с именами вершин).
+        Возвращает словарь: общий объём в байтах, число записей рёбер и байты на ребро.
+        Рост этих значений по сравнению с замеренными проверяет memory_check.py.
+        """
+        if self._csr is not None:
+            total = self._csr.nbytes()
+            records = self._csr.edge_count()
+        else:
+            tables = [self.adjacency_list]
+            if self.reverse_adjacency is not None:
+                tables.append(self.reverse_adjacency)
+            total = 0
+            weights = {}  # Один и тот же объект веса учитываем один раз
+            for table in tables:
+                total += sys.getsizeof(table)
+                for neighbors in table.values():
+                    total += sys.getsizeof(neighbors)
+                    if self.weighted:
+                        for weight in neighbors.values():
+                            weights[id(weight)] = weight
+            total += sum(sys.getsizeof(weight) for weight in weights.values())
+            records = sum(len(neighbors) for neighbors in self.adjacency_list.values())
+
+        return {
+            'bytes': total,
+            'edge_records': records,
+            'bytes_per_edge': total / records if records else 0.0,
+        }
+
+    def to_networkx(self, cache=False):
         """
         Преобразует граф в объект NetworkX для визуализации.
+        При cache=True возвращается один и тот же объект, пока граф не изменился;
+        такой объект общий, изменять его нельзя.
         """
+        if cache:
+            return self._cached('to_networkx', (), self._to_networkx)
+        return self._to_networkx()
+
+    def _to_networkx(self):
         import networkx as nx
 
         # Выбор типа графа: ориентированный или неориентированный
         nx_graph = nx.DiGraph() if self.directed else nx.Graph()
 
-        # Добавление рёбер и весов
-        for u, edges in self.adjacency_list.items():
-            for edge in edges:
-                v = edge[0]  # Соседняя вершина
-                weight = edge[1] if self.weighted else None
-                if self.weighted:
-                    nx_graph.add_edge(u, v, weight=weight)
-                else:
-                    nx_graph.add_edge(u, v)
+        # Вершины и рёбра добавляются пакетно; неориентированное ребро передаётся один раз
+        nx_graph.add_nodes_from(self.adjacency_list)
+        if self.weighted:
+            nx_graph.add_weighted_edges_from(self._iter_edges())
+        else:
+            nx_graph.add_edges_from((u, v) for u, v, _ in self._iter_edges())
 
         return nx_graph
 
-    def load_from_file(self, filename):
-        with open(filename, 'r') as file:
-            lines = file.readlines()
+    def _iter_edges(self):
+        """
+        Перебирает рёбра кортежами (u, v, вес). Неориентированное ребро выдаётся один раз —
+        у вершины, встреченной первой; петли тоже выдаются.
+        """
+        if self.directed:
+            for u, neighbors in self.adjacency_list.items():
+                for v, weight in neighbors.items():
+                    yield u, v, weight
+            return
+
+        written = set()
+        for u, neighbors in self.adjacency_list.items():
+            for v, weight in neighbors.items():
+                if v not in written:
+                    yield u, v, weight
+            written.add(u)
+
+    def load_from_file(self, filename, verbose=True, progress=None, progress_step=100000, workers=1,
+                       replay_log=True, vertex_filter=None, numeric_ids=False):
+        """
+        Загружает граф из файла. Файл читается построчно, без загрузки целиком в память.
+
+        verbose=False отключает вывод содержимого графа (для больших файлов).
+        progress — необязательная функция progress(число_строк), вызываемая каждые
+        progress_step строк и по окончании чтения.
+        Если рядом с файлом есть журнал изменений (filename + '.log'), он применяется
+        поверх загруженного графа; replay_log=False отключает это.
+        workers > 1 включает разбор файла по частям в пуле процессов (None — по числу ядер).
+        vertex_filter — множество вершин или функция-предикат: загружаются только принятые
+        им вершины и рёбра между ними (фильтр применяется во время чтения, в том числе
+        к записям журнала изменений).
+        numeric_ids=True — быстрый разбор файла с числовыми именами вершин средствами NumPy;
+        вершины загружаются как целые числа.
+
+        Файлы .gz, .bz2 и .xz распознаются по сигнатуре и распаковываются потоково:
+        распаковка идёт в отдельном потоке параллельно с разбором строк. Сжатый файл
+        нельзя разделить на диапазоны байтов, поэтому он всегда читается последовательно.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if vertex_filter is None or callable(vertex_filter):
+            accept = vertex_filter
+        else:
+            accept = vertex_filter.__contains__
+
+        if numeric_ids:
+            self._load_numeric(filename, progress, accept)
+        elif workers > 1 and compression_opener(filename) is None:
+            self._load_parallel(filename, workers, progress, accept)
+        else:
+            with open_lines(filename) as lines:
+                self._load_lines(lines, progress, progress_step, accept)
+
+        if replay_log and os.path.exists(self.log_filename(filename)):
+            self._replay_log(self.log_filename(filename), accept, int if numeric_ids else None)
 
+        if verbose:
+            self._print_loaded(filename)
+
+    def _load_lines(self, lines, progress=None, progress_step=100000, accept=None):
+        """
+        Строит граф по строкам файла (заголовок и рёбра) за один проход.
+        accept — необязательный предикат для вершин: отвергнутые вершины и их рёбра пропускаются.
+        """
+        lines = iter(lines)
         # Определяем тип графа (направленный/ненаправленный) и взвешенный/невзвешенный
-        header = lines[0].strip().lower().split()
-        self.directed = header[0] == 'directed'
-        self.weighted = header[1] == 'weighted'
+        directed, weighted = parse_header(next(lines, ''))
 
-        # Используем словарь для хранения графа
-        self.graph = {}
-        all_vertices = set()
+        adjacency_list = {}
+        line_count = 1
+        for line_count, line in enumerate(lines, 2):
+            if progress is not None and line_count % progress_step == 0:
+                progress(line_count)
 
-        for i, line in enumerate(lines[1:]):
-            parts = line.strip().split()
+            parts = line.split()
+            if not parts:
+                continue
 
+            u = parts[0]
+            if accept is not None:
+                if not accept(u):
+                    if len(parts) > 1 and accept(parts[1]) and parts[1] not in adjacency_list:
+                        adjacency_list[parts[1]] = {}
+                    continue
+                if len(parts) > 1 and not accept(parts[1]):
+                    parts = parts[:1]  # Ребро к отвергнутой вершине пропускаем, саму u оставляем
+            if u not in adjacency_list:
+                adjacency_list[u] = {}
             if len(parts) == 1:
-                vertex = parts[0]
-                all_vertices.add(vertex)
-                self.graph.setdefault(vertex, [])
-                continue
+                continue  # Обособленная вершина
 
-            if self.weighted:
-                u, v, weight = parts[0], parts[1], float(parts[2])
-                all_vertices.update([u, v])
-                self.graph.setdefault(u, []).append((v, weight))
-                if not self.directed:
-                    if u != v:
-                        self.graph.setdefault(v, []).append((u, weight))
+            v = parts[1]
+            if weighted:
+                if len(parts) < 3:
+                    raise ValueError(f"Строка {line_count}: для взвешенного графа нужен вес ребра")
+                weight = float(parts[2])
             else:
-                u, v = parts[0], parts[1]
-                all_vertices.update([u, v])
-                self.graph.setdefault(u, []).append((v, None))
-                if not self.directed:
-                    if u != v:
-                        self.graph.setdefault(v, []).append((u, None))
+                weight = None
+            adjacency_list[u][v] = weight
+            if v not in adjacency_list:
+                adjacency_list[v] = {}
+            if not directed and u != v:
+                adjacency_list[v][u] = weight
 
-        # Обеспечиваем наличие всех вершин, включая обособленные
-        for vertex in all_vertices:
-            if vertex not in self.graph:
-                self.graph[vertex] = []
+        if progress is not None:
+            progress(line_count)
 
-        # Копируем данные из self.graph в self.adjacency_list для дальнейшего использования
-        self.adjacency_list = self.graph.copy()
+        self._set_loaded(directed, weighted, adjacency_list)
 
+    def _load_parallel(self, filename, workers, progress=None, accept=None):
+        """
+        Разбирает файл по частям в пуле процессов. Файл делится на диапазоны байтов
+        по границам строк, каждая часть разбирается в массивы рёбер с локальными номерами
+        вершин, затем части объединяются по порядку с общей таблицей имён — порядок вершин
+        и рёбер получается тем же, что и при последовательном чтении.
+        """
+        encoding = locale.getpreferredencoding(False)  # Та же кодировка, что у open() по умолчанию
+        with open(filename, 'rb') as file:
+            header_line = file.readline()
+        directed, weighted = parse_header(header_line.decode(encoding))
+        tasks = [(filename, start, end, weighted, encoding)
+                 for start, end in split_ranges(filename, len(header_line), workers * 4)]
+
+        adjacency_list = {}  # Общая таблица вершин: имя -> словарь соседей
+        line_count = 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for names, sources, targets, weights, chunk_lines in executor.map(parse_chunk, tasks):
+                rows = []  # Локальный номер вершины в части -> её словарь соседей (None — вершина отвергнута)
+                for name in names:
+                    if accept is not None and not accept(name):
+                        rows.append(None)
+                        continue
+                    row = adjacency_list.get(name)
+                    if row is None:
+                        row = adjacency_list[name] = {}
+                    rows.append(row)
+
+                for u, v, weight in zip(sources, targets, weights if weighted else itertools.repeat(None)):
+                    if rows[u] is None or rows[v] is None:
+                        continue
+                    rows[u][names[v]] = weight
+                    if not directed and u != v:
+                        rows[v][names[u]] = weight
+
+                line_count += chunk_lines
+                if progress is not None:
+                    progress(line_count)
+
+        self._set_loaded(directed, weighted, adjacency_list)
+
+    def _load_numeric(self, filename, progress=None, accept=None):
+        """
+        Разбирает файл с числовыми именами вершин одним вызовом numpy.loadtxt вместо
+        split()/float() для каждой строки. Если в файле есть строки с обособленными
+        вершинами (число столбцов разное), файл разбирается обычным способом.
+        """
+        import numpy as np
+
+        with open_lines(filename) as lines:
+            lines = iter(lines)
+            directed, weighted = parse_header(next(lines, ''))
+            try:
+                data = np.loadtxt(lines, dtype=np.float64 if weighted else np.int64, ndmin=2)
+            except ValueError:
+                data = None
+
+        if data is None or (data.size and data.shape[1] < (3 if weighted else 2)):
+            with open_lines(filename) as lines:
+                self._load_lines(lines, progress, accept=None if accept is None else lambda name: accept(int(name)))
+            self._set_loaded(self.directed, self.weighted,
+                             {int(u): {int(v): weight for v, weight in neighbors.items()}
+                              for u, neighbors in self.adjacency_list.items()})
+            return
+
+        if not data.size:
+            data = np.zeros((0, 3 if weighted else 2))
+        sources = data[:, 0].astype(np.int64).tolist()
+        targets = data[:, 1].astype(np.int64).tolist()
+        weights = data[:, 2].tolist() if weighted else None
+        self._set_loaded(directed, weighted,
+                         self._adjacency_from_columns(sources, targets, weights, directed, accept=accept))
+        if progress is not None:
+            progress(len(sources) + 1)
+
+    @staticmethod
+    def _adjacency_from_columns(sources, targets, weights, directed, vertices=(), accept=None):
+        """
+        Строит словарь смежности по столбцам рёбер (источники, приёмники, веса или None).
+        Вершины идут в порядке первого появления; повторное ребро заменяет вес.
+        """
+        adjacency_list = {vertex: {} for vertex in vertices}
+        for u, v, weight in zip(sources, targets, itertools.repeat(None) if weights is None else weights):
+            if accept is not None:
+                if not accept(u) or not accept(v):
+                    for vertex in (u, v):
+                        if vertex not in adjacency_list and accept(vertex):
+                            adjacency_list[vertex] = {}
+                    continue
+            row = adjacency_list.get(u)
+            if row is None:
+                row = adjacency_list[u] = {}
+            row[v] = weight
+            if v not in adjacency_list:
+                adjacency_list[v] = {}
+            if not directed and u != v:
+                adjacency_list[v][u] = weight
+        return adjacency_list
+
+    @classmethod
+    def from_edge_array(cls, src, dst, weight=None, directed=False, vertices=None, **options):
+        """
+        Создаёт граф по столбцам рёбер: массивам NumPy (или спискам) источников, приёмников
+        и, для взвешенного графа, весов. vertices — необязательный список вершин, включая
+        обособленные. Остальные параметры передаются в конструктор Graph.
+        """
+        columns = [column.tolist() if hasattr(column, 'tolist') else column
+                   for column in (src, dst, weight, vertices)]
+        sources, targets, weights, vertices = columns
+        if len(sources) != len(targets) or (weights is not None and len(weights) != len(sources)):
+            raise ValueError("Массивы рёбер должны быть одной длины")
+        if weights is not None:
+            weights = [float(w) for w in weights]
+
+        graph = cls(directed=directed, weighted=weights is not None, **options)
+        graph._set_loaded(directed, weights is not None,
+                          cls._adjacency_from_columns(sources, targets, weights, directed, vertices or ()))
+        return graph
+
+    def to_edge_arrays(self):
+        """
+        Возвращает рёбра графа массивами NumPy (src, dst, weight); weight равен None
+        для невзвешенного графа. Неориентированное ребро входит в массивы один раз.
+        """
+        import numpy as np
+
+        edges = list(self._iter_edges())
+        sources = np.array([u for u, _, _ in edges])
+        targets = np.array([v for _, v, _ in edges])
+        weights = np.array([w for _, _, w in edges], dtype=np.float64) if self.weighted else None
+        return sources, targets, weights
+
+    def load_csv(self, filename, source=0, target=1, weight=None, delimiter=None, header=True, directed=False):
+        """
+        Загружает граф из списка рёбер CSV/TSV (в том числе сжатого). Столбцы задаются номерами
+        или именами из строки заголовка, weight=None — невзвешенный граф. Разделитель по умолчанию
+        выбирается по расширению (.tsv — табуляция). Строки без приёмника задают обособленные вершины.
+        Возвращает определённый при чтении тип весов: 'int', 'float' или None.
+        """
+        vertices, sources, targets, weights, weight_type = read_csv_edges(
+            filename, source, target, weight, delimiter, header)
+        self._set_loaded(directed, weights is not None,
+                         self._adjacency_from_columns(sources, targets, weights, directed, vertices))
+        return weight_type
+
+    def save_csv(self, filename, delimiter=None, header=True):
+        """
+        Сохраняет рёбра графа в CSV/TSV (неориентированное ребро — один раз).
+        Целые веса записываются без дробной части. Обособленные вершины записываются
+        строками без приёмника.
+        """
+        weight_type = detect_weight_type(self._iter_weights()) if self.weighted else None
+        isolated = [vertex for vertex in self.out_degree_index.below(1) if self.in_degree(vertex) == 0]
+        with atomic_text_writer(filename) as file:
+            write_csv_edges(file, self._iter_edges(), self.weighted, weight_type,
+                            delimiter or csv_delimiter(filename), header, isolated)
+
+    def load_matrix_market(self, filename):
+        """
+        Загружает граф из файла Matrix Market (координатный формат). Вершины — целые номера
+        от 1 до размера матрицы; symmetric — неориентированный граф, pattern — невзвешенный.
+        Возвращает тип весов: 'int' (integer), 'float' (real) или None (pattern).
+        """
+        directed, vertex_count, sources, targets, weights, weight_type = read_matrix_market(filename)
+        self._set_loaded(directed, weights is not None,
+                         self._adjacency_from_columns(sources, targets, weights, directed,
+                                                      range(1, vertex_count + 1)))
+        return weight_type
+
+    def save_matrix_market(self, filename):
+        """
+        Сохраняет граф в формате Matrix Market. Если вершины — целые числа от 1, номера
+        сохраняются, иначе вершины нумеруются по порядку (имена при этом не сохраняются).
+        Целые веса записываются с типом integer.
+        """
+        vertices = list(self.adjacency_list)
+        if all(isinstance(vertex, int) and vertex >= 1 for vertex in vertices):
+            number = {vertex: vertex for vertex in vertices}
+            vertex_count = max(vertices, default=0)
+        else:
+            number = {vertex: i for i, vertex in enumerate(vertices, 1)}
+            vertex_count = len(vertices)
+        weight_type = detect_weight_type(self._iter_weights()) if self.weighted else None
+        edges = ((number[u], number[v], weight) for u, v, weight in self._iter_edges())
+        with atomic_text_writer(filename) as file:
+            write_matrix_market(file, vertex_count, edges, self.directed, self.weighted, weight_type)
+
+    def _iter_weights(self):
+        for neighbors in self.adjacency_list.values():
+            yield from neighbors.values()
+
+    def load_neighborhood(self, filename, seeds, k=1, direction='out', verbose=True, **options):
+        """
+        Загружает из файла только k-окрестность вершин seeds: вершины на расстоянии
+        не больше k переходов и рёбра между ними. Полный граф в память не строится:
+        k проходов по файлу расширяют фронт на один переход каждый, хранится только
+        множество найденных вершин, а последний проход загружает рёбра между ними.
+
+        direction для ориентированного графа: 'out' — по исходящим рёбрам,
+        'in' — по входящим, 'both' — в обе стороны. Остальные параметры передаются
+        в load_from_file. Возвращает множество вершин окрестности.
+        При numeric_ids=True имена вершин — целые числа: seeds можно задать числами или строками.
+        Окрестность строится по графу с учётом журнала изменений filename.log (если replay_log
+        не отключён): рёбра из журнала расширяют фронт, удалённые в нём рёбра и вершины — нет.
+        """
+        if direction not in ('in', 'out', 'both'):
+            raise ValueError(f"Неизвестное направление: '{direction}'")
+        # Имена вершин должны совпадать с теми, что создаст load_from_file
+        key = int if options.get('numeric_ids') else str
+        with open_lines(filename) as lines:
+            directed, _ = parse_header(next(iter(lines), ''))
+        forward = not directed or direction != 'in'
+        backward = not directed or direction != 'out'
+
+        log_name = self.log_filename(filename)
+        overlay = None
+        if options.get('replay_log', True) and os.path.exists(log_name):
+            overlay = self._log_overlay(log_name, directed, key)
+
+        reached = {key(seed) for seed in seeds}
+        frontier = set(reached)
+        for _ in range(k):
+            if not frontier:
+                break
+            found = set()
+            with open_lines(filename) as lines:
+                lines = iter(lines)
+                next(lines, '')
+                edges = (line.split() for line in lines)
+                edges = ((key(parts[0]), key(parts[1])) for parts in edges if len(parts) >= 2)
+                if overlay is not None:
+                    base_alive, log_edges = overlay
+                    edges = itertools.chain((edge for edge in edges if base_alive(*edge)), log_edges)
+                for u, v in edges:
+                    if forward and u in frontier and v not in reached:
+                        found.add(v)
+                    if backward and v in frontier and u not in reached:
+                        found.add(u)
+            reached |= found
+            frontier = found
+
+        self.load_from_file(filename, verbose=verbose, vertex_filter=reached, **options)
+        return reached
+
+    @staticmethod
+    def _log_overlay(log_name, directed, key):
+        """
+        Итог журнала изменений для просмотра рёбер файла без построения графа:
+        (проверка, что ребро основного файла не удалено журналом, список рёбер, добавленных журналом).
+        Удаление вершины удаляет все её рёбра, записанные раньше; для неориентированного графа
+        ребро учитывается в обоих направлениях.
+        """
+        removed_at = {}  # Вершина -> номер последней записи с её удалением
+        edge_records = {}  # (u, v) -> (номер последней записи о ребре, есть ли ребро после неё)
+        for number, (operation, args) in enumerate(read_log(log_name)):
+            names = [key(vertex) for vertex in args[:2]]
+            if operation == 'remove_vertex':
+                removed_at[names[0]] = number
+            elif operation in ('add_edge', 'remove_edge'):
+                u, v = names
+                edge_records[(u, v)] = (number, operation == 'add_edge')
+                if not directed:
+                    edge_records[(v, u)] = (number, operation == 'add_edge')
+
+        def survives(u, v, number):
+            return number > removed_at.get(u, -1) and number > removed_at.get(v, -1)
+
+        def base_alive(u, v):
+            record = edge_records.get((u, v))
+            if record is None:
+                return u not in removed_at and v not in removed_at
+            return record[1] and survives(u, v, record[0])
+
+        log_edges = [(u, v) for (u, v), (number, present) in edge_records.items()
+                     if present and survives(u, v, number)]
+        return base_alive, log_edges
+
+    def _set_loaded(self, directed, weighted, adjacency_list):
+        self.directed = directed
+        self.weighted = weighted
+        self.adjacency_list = adjacency_list
+        self._csr = None
+        self._rebuild_indexes()
+        self._record('reset')
+
+    def _print_loaded(self, filename):
         # Вывод содержимого графа:
         print(f"Граф из файла '{filename}' загружен. Вот его содержимое:")
-        for vertex, edges in self.graph.items():
+        for vertex, edges in self.adjacency_list.items():
             if edges:
                 if self.weighted:
-                    edges_str = ', '.join(f"{v} (вес: {weight})" for v, weight in edges)
+                    edges_str = ', '.join(f"{v} (вес: {weight})" for v, weight in edges.items())
                 else:
-                    edges_str = ', '.join(v for v, _ in edges)
+                    edges_str = ', '.join(edges)
                 print(f"{vertex}: {edges_str}")
+            elif self.directed and self.in_degree(vertex) > 0:
+                print(f"{vertex}: нет исходящих рёбер")
             else:
-                if self.directed:
-                    has_incoming = any(vertex in [v for v, _ in adj] for adj in self.graph.values())
-                    if has_incoming:
-                        print(f"{vertex}: нет исходящих рёбер")
-                    else:
-                        print(f"{vertex}: нет рёбер")
-                else:
-                    print(f"{vertex}: нет рёбер")
+                print(f"{vertex}: нет рёбер")
 
         # Вывод типа графа:
         graph_type = "Ориентированный" if self.directed else "Неориентированный"
         weight_type = "Взвешенный" if self.weighted else "Невзвешенный"
         print(f"Тип графа: {graph_type}, {weight_type}")
 
+    @staticmethod
+    def log_filename(filename):
+        """Имя файла журнала изменений для основного файла графа."""
+        return filename + '.log'
+
+    def attach_log(self, filename, sync_every=64):
+        """
+        Начинает дописывать изменения графа в журнал рядом с основным файлом filename.
+        Сохранение изменения стоит одной строки журнала, а не перезаписи всего графа;
+        load_from_file(filename) применит журнал поверх основного файла.
+        """
+        self.detach_log()
+        self.mutation_log = MutationLog(self.log_filename(filename), sync_every)
+        self.log_base = filename
+
+    def detach_log(self):
+        """Сбрасывает журнал на диск и перестаёт записывать в него изменения."""
+        if self.mutation_log is not None:
+            self.mutation_log.close()
+            self.mutation_log = None
+            self.log_base = None
+
+    def compact_log(self):
+        """
+        Переносит журнал в основной файл: граф целиком сохраняется в основной файл,
+        затем журнал очищается. Сбой между этими шагами безопасен — повторное применение
+        журнала к уже сохранённому графу ничего не меняет. Возвращает отчёт save_to_file.
+        """
+        if self.mutation_log is None:
+            raise ValueError("Журнал изменений не подключён: вызовите attach_log()")
+        report = self.save_to_file(self.log_base)
+        self.mutation_log.clear()
+        return report
+
+    def _replay_log(self, log_name, accept=None, key=None):
+        """
+        Применяет записи журнала изменений к графу без вывода в консоль.
+        Записи с вершинами, отвергнутыми предикатом accept, пропускаются.
+        key — необязательное преобразование имён вершин из журнала (например, int).
+        """
+        adjacency_list = self.adjacency_list
+        for operation, args in read_log(log_name):
+            if key is not None:
+                args = tuple(key(vertex) for vertex in args[:2]) + args[2:]
+            if accept is not None and not all(accept(vertex) for vertex in args[:2]):
+                continue
+            if operation == 'add_vertex':
+                if args[0] not in adjacency_list:
+                    self._insert_vertex(args[0])
+            elif operation == 'remove_vertex':
+                if args[0] in adjacency_list:
+                    self._delete_vertex(args[0])
+            else:
+                u, v = args[0], args[1]
+                deltas = self._new_degree_deltas()
+                if operation == 'add_edge':
+                    for vertex in (u, v):
+                        if vertex not in adjacency_list:
+                            self._insert_vertex(vertex)
+                    self._set_edge(u, v, args[2], True, deltas)
+                else:
+                    self._unset_edge(u, v, deltas)
+                self._apply_degree_deltas(deltas)
+
+    def save_binary(self, filename):
+        """
+        Сохраняет граф в бинарный снимок (заголовок, таблица имён, массивы CSR).
+        Имена вершин сохраняются как строки, как и в текстовом формате.
+        """
+        self.to_csr().save_binary(filename)
+
+    def load_binary(self, filename):
+        """
+        Загружает граф из бинарного снимка через mmap без разбора текста.
+        Граф загружается замороженным: алгоритмы работают прямо с отображённым файлом,
+        для изменения графа нужно вызвать thaw().
+        """
+        csr = CSRGraph.load_binary(filename)
+        self.directed = csr.directed
+        self.weighted = csr.weighted
+        self._csr = csr
+        self.adjacency_list = CSRAdjacencyView(csr)
+        self._rebuild_indexes()
+        self._record('reset')
+
     def display_adjacency_list(self):
         for vertex in self.adjacency_list:
             if self.weighted:
-                edges = ', '.join(f"{adj} ({weight})" for adj, weight in self.adjacency_list[vertex])
+                edges = ', '.join(f"{adj} ({weight})" for adj, weight in self.adjacency_list[vertex].items())
             else:
-                edges = ', '.join(str(adj) for adj, *_ in self.adjacency_list[vertex])
+                edges = ', '.join(str(adj) for adj in self.adjacency_list[vertex])
             print(f"{vertex}: {edges if edges else ''}")
 
     def add_vertex(self, vertex):
+        if not self._begin_write():
+            return
         if vertex not in self.adjacency_list:
-            self.adjacency_list[vertex] = []
+            self._insert_vertex(vertex)
         else:
             print(f"Вершина {vertex} уже существует.")
 
     def add_edge(self, u, v, weight=None, overwrite=False):
+        if not self._begin_write():
+            return False
+
         # Проверяем существование обеих вершин
         if u not in self.adjacency_list or v not in self.adjacency_list:
             print(f"Ошибка: Вершины '{u}' и/или '{v}' не существуют.")
@@ -126,106 +870,283 @@ class Graph:
             if weight is None:
                 print("Ошибка: Для взвешенного графа необходимо указать вес ребра.")
                 return False
+            weight = float(weight)  # Все веса хранятся как float, как и в CSR-массиве weights
         else:
             weight = None  # В невзвешенном графе вес не хранится
 
         # Проверяем существование ребра
-        existing_edge = next(((i, w) for i, (neighbor, *w) in enumerate(self.adjacency_list[u]) if neighbor == v),
-                             None)
-
-        if existing_edge:
-            if overwrite:
-                index, _ = existing_edge
-                if self.weighted:
-                    self.adjacency_list[u][index] = (v, weight)
-                else:
-                    self.adjacency_list[u][index] = (v,)  # Для невзвешенного графа
-                print(f"Ребро {u}-{v} обновлено.")
-            else:
+        if v in self.adjacency_list[u]:
+            if not overwrite:
                 print(f"Ребро {u}-{v} уже существует.")
                 return False  # Указывает, что ребро уже существует и не было перезаписано
+            self._set_edge(u, v, weight, True, None)
+            print(f"Ребро {u}-{v} обновлено.")
         else:
+            deltas = self._new_degree_deltas()
+            self._set_edge(u, v, weight, overwrite, deltas)
+            self._apply_degree_deltas(deltas)
             if self.weighted:
-                self.adjacency_list[u].append((v, weight))
                 print(f"Ребро {u}-{v} добавлено с весом {weight}.")
             else:
-                self.adjacency_list[u].append((v,))
                 print(f"Ребро {u}-{v} добавлено.")
 
-        if not self.directed and u != v:
-            existing_reverse_edge = next(
-                ((i, w) for i, (neighbor, *w) in enumerate(self.adjacency_list[v]) if neighbor == u), None)
-            if existing_reverse_edge:
-                if overwrite and self.weighted:
-                    index, _ = existing_reverse_edge
-                    self.adjacency_list[v][index] = (u, weight)
-            else:
-                if self.weighted:
-                    self.adjacency_list[v].append((u, weight))
-                else:
-                    self.adjacency_list[v].append((u,))
-
         return True  # Указывает, что ребро было успешно добавлено или обновлено
 
     def remove_vertex(self, vertex):
+        if not self._begin_write():
+            return
         if vertex in self.adjacency_list:
-            # Удаляем все рёбра, связанные с этой вершиной
-            self.adjacency_list.pop(vertex)
-            for adj in self.adjacency_list:
-                if self.weighted:
-                    self.adjacency_list[adj] = [(v, w) for v, w in self.adjacency_list[adj] if v != vertex]
-                else:
-                    self.adjacency_list[adj] = [v for v, *_ in self.adjacency_list[adj] if v != vertex]
+            self._delete_vertex(vertex)
         else:
             print(f"Вершина {vertex} не существует.")
 
+    def _delete_vertex(self, vertex):
+        """Удаляет существующую вершину вместе со всеми связанными рёбрами."""
+        deltas = self._new_degree_deltas()
+        out_delta, in_delta = deltas
+
+        # Удаляем все рёбра, связанные с этой вершиной: обходим только её соседей
+        neighbors = self.adjacency_list.pop(vertex)
+        if self._owned_rows is not None:
+            self._owned_rows.discard(vertex)
+        if self.directed:
+            for successor in neighbors:
+                if successor != vertex:
+                    in_delta[successor] -= 1
+                    if self.reverse_adjacency is not None:
+                        del self._reverse_row(successor)[vertex]
+            if self.reverse_adjacency is not None:
+                predecessors = self.reverse_adjacency.pop(vertex)
+                if self._owned_reverse_rows is not None:
+                    self._owned_reverse_rows.discard(vertex)
+            else:
+                predecessors = [u for u, adj in self.adjacency_list.items() if vertex in adj]
+            for predecessor in predecessors:
+                if predecessor != vertex:
+                    del self._row(predecessor)[vertex]
+                    out_delta[predecessor] -= 1
+        else:
+            for neighbor in neighbors:
+                if neighbor != vertex:
+                    del self._row(neighbor)[vertex]
+                    out_delta[neighbor] -= 1
+
+        self._apply_degree_deltas(deltas)
+        self.out_degree_index.remove(vertex)
+        self.in_degree_index.remove(vertex)
+        self._record('remove_vertex', vertex)
+
     def remove_edge(self, u, v):
+        if not self._begin_write():
+            return
         if u in self.adjacency_list:
-            if self.weighted:
-                original_length = len(self.adjacency_list[u])
-                self.adjacency_list[u] = [(x, w) for x, w in self.adjacency_list[u] if x != v]
-                if len(self.adjacency_list[u]) < original_length:
-                    print(f"Ребро {u}-{v} удалено.")
-                else:
-                    print(f"Ребро {u}-{v} не существует.")
+            deltas = self._new_degree_deltas()
+            if self._unset_edge(u, v, deltas):
+                self._apply_degree_deltas(deltas)
+                print(f"Ребро {u}-{v} удалено.")
             else:
-                original_length = len(self.adjacency_list[u])
-                self.adjacency_list[u] = [x for x, *_ in self.adjacency_list[u] if x != v]
-                if len(self.adjacency_list[u]) < original_length:
-                    print(f"Ребро {u}-{v} удалено.")
-                else:
-                    print(f"Ребро {u}-{v} не существует.")
+                print(f"Ребро {u}-{v} не существует.")
+        else:
+            print(f"Вершина {u} не существует.")
 
-            if not self.directed:
+    def add_vertices_from(self, vertices):
+        """
+        Добавляет вершины пакетом без вывода в консоль. Уже существующие вершины пропускаются.
+        Возвращает количество добавленных вершин.
+        """
+        if not self._begin_write():
+            return 0
+        if hasattr(vertices, 'tolist'):  # Массив NumPy
+            vertices = vertices.tolist()
+
+        added = 0
+        for vertex in vertices:
+            if vertex not in self.adjacency_list:
+                self._insert_vertex(vertex)
+                added += 1
+        return added
+
+    def add_edges_from(self, edges, overwrite=False):
+        """
+        Добавляет рёбра пакетом за один проход без вывода в консоль.
+        Рёбра задаются кортежами (u, v) или (u, v, вес) либо двумерным массивом NumPy.
+        Отсутствующие вершины создаются автоматически. Существующее ребро заменяется
+        только при overwrite=True. Возвращает количество новых рёбер.
+        """
+        if not self._begin_write():
+            return 0
+        if hasattr(edges, 'tolist'):  # Массив NumPy
+            edges = edges.tolist()
+
+        adjacency_list = self.adjacency_list
+        # Изменения степеней копим и применяем к индексам один раз в конце; при ошибке в середине
+        # пакета уже вставленные рёбра остаются, поэтому их изменения степеней применяются в finally
+        deltas = self._new_degree_deltas()
+        added = 0
+
+        try:
+            for edge in edges:
+                u, v = edge[0], edge[1]
                 if self.weighted:
-                    self.adjacency_list[v] = [(x, w) for x, w in self.adjacency_list[v] if x != u]
+                    if len(edge) < 3 or edge[2] is None:
+                        raise ValueError(f"Для взвешенного графа необходимо указать вес ребра {u}-{v}.")
+                    weight = float(edge[2])
                 else:
-                    self.adjacency_list[v] = [x for x, *_ in self.adjacency_list[v] if x != u]
-        else:
-            print(f"Вершина {u} не существует.")
+                    weight = None
 
-    def save_to_file(self, filename):
-        with open(filename, 'w') as file:
-            type_line = ""
-            if self.directed and self.weighted:
-                type_line = "directed weighted"
-            elif self.directed and not self.weighted:
-                type_line = "directed unweighted"
-            elif not self.directed and self.weighted:
-                type_line = "undirected weighted"
-            else:
-                type_line = "undirected unweighted"
-            file.write(f"{type_line}\n")
-            for vertex in self.adjacency_list:
-                if not self.adjacency_list[vertex]:
-                    file.write(f"{vertex}\n")
+                if u not in adjacency_list:
+                    self._insert_vertex(u)
+                if v not in adjacency_list:
+                    self._insert_vertex(v)
+
+                if self._set_edge(u, v, weight, overwrite, deltas):
+                    added += 1
+        finally:
+            self._apply_degree_deltas(deltas)
+        return added
+
+    def remove_edges_from(self, edges):
+        """
+        Удаляет рёбра пакетом без вывода в консоль. Отсутствующие рёбра пропускаются.
+        Возвращает количество удалённых рёбер.
+        """
+        if not self._begin_write():
+            return 0
+        if hasattr(edges, 'tolist'):  # Массив NumPy
+            edges = edges.tolist()
+
+        deltas = self._new_degree_deltas()
+        removed = 0
+        try:
+            for edge in edges:
+                if self._unset_edge(edge[0], edge[1], deltas):
+                    removed += 1
+        finally:
+            self._apply_degree_deltas(deltas)
+        return removed
+
+    # Низкоуровневые операции изменения графа. Они поддерживают согласованность списка смежности,
+    # обратных списков и индексов степеней, ничего не проверяют и не выводят в консоль.
+    def _insert_vertex(self, vertex):
+        self.adjacency_list[vertex] = {}
+        if self._owned_rows is not None:
+            self._owned_rows.add(vertex)
+        if self.reverse_adjacency is not None:
+            self.reverse_adjacency[vertex] = {}
+            if self._owned_reverse_rows is not None:
+                self._owned_reverse_rows.add(vertex)
+        self.out_degree_index.add(vertex)
+        self.in_degree_index.add(vertex)
+        self._record('add_vertex', vertex)
+
+    def _set_edge(self, u, v, weight, overwrite, deltas):
+        """
+        Вставляет ребро u-v (или меняет его вес при overwrite=True). Обе вершины должны существовать.
+        Возвращает True, если ребро новое.
+        """
+        if v in self.adjacency_list[u]:
+            old_weight = self.adjacency_list[u][v]
+            if overwrite and old_weight != weight:
+                self._row(u)[v] = weight
+                if self.reverse_adjacency is not None:
+                    self._reverse_row(v)[u] = weight
+                if not self.directed and u != v:
+                    self._row(v)[u] = weight
+                self._record('set_weight', u, v, old_weight, weight)
+            return False
+
+        out_delta, in_delta = deltas
+        self._row(u)[v] = weight
+        out_delta[u] += 1
+        if self.directed:
+            in_delta[v] += 1
+            if self.reverse_adjacency is not None:
+                self._reverse_row(v)[u] = weight
+        elif u != v:
+            self._row(v)[u] = weight
+            out_delta[v] += 1
+        self._record('add_edge', u, v, weight)
+        return True
+
+    def _unset_edge(self, u, v, deltas):
+        """Удаляет ребро u-v. Возвращает True, если ребро существовало."""
+        neighbors = self.adjacency_list.get(u)
+        if neighbors is None or v not in neighbors:
+            return False
+
+        out_delta, in_delta = deltas
+        weight = self._row(u).pop(v)
+        out_delta[u] -= 1
+        if self.directed:
+            in_delta[v] -= 1
+            if self.reverse_adjacency is not None:
+                del self._reverse_row(v)[u]
+        elif u != v:
+            del self._row(v)[u]
+            out_delta[v] -= 1
+        self._record('remove_edge', u, v, weight)
+        return True
+
+    @staticmethod
+    def _new_degree_deltas():
+        return defaultdict(int), defaultdict(int)
+
+    def _apply_degree_deltas(self, deltas):
+        out_delta, in_delta = deltas
+        for vertex, delta in out_delta.items():
+            if delta:
+                self.out_degree_index.change(vertex, delta)
+        for vertex, delta in in_delta.items():
+            if delta:
+                self.in_degree_index.change(vertex, delta)
+
+    def save_to_file(self, filename, batch_size=8192):
+        """
+        Сохраняет граф в текстовый файл. Строки рёбер собираются пачками по batch_size
+        и каждая пачка записывается одним вызовом write. Запись идёт во временный файл, который после
+        завершения атомарно заменяет filename, поэтому сбой посередине не портит старый файл.
+        Для имён с расширением .gz, .bz2 и .xz файл сжимается при записи.
+
+        Возвращает отчёт: число строк, размер файла в байтах, время и скорость записи (байт/с).
+        """
+        started = time.perf_counter()
+        directed, weighted = self.directed, self.weighted
+        type_line = f"{'directed' if directed else 'undirected'} {'weighted' if weighted else 'unweighted'}\n"
+        line_count = 1
+
+        with atomic_text_writer(filename) as file:
+            file.write(type_line)
+            batch = []
+            written = set()  # Вершины, рёбра которых уже записаны (для неориентированного графа)
+            for vertex, neighbors in self.adjacency_list.items():
+                if not neighbors:
+                    batch.append(f"{vertex}\n")
+                    continue
+                if not directed:
+                    # Неориентированное ребро записываем один раз — у вершины, встреченной первой.
+                    # Петля (neighbor == vertex) тоже записывается, так как vertex ещё не в written.
+                    neighbors = {neighbor: weight for neighbor, weight in neighbors.items()
+                                 if neighbor not in written}
+                    written.add(vertex)
+                if weighted:
+                    batch.extend([f"{vertex} {neighbor} {weight}\n" for neighbor, weight in neighbors.items()])
                 else:
-                    for edge in self.adjacency_list[vertex]:
-                        if self.directed or (not self.directed and vertex < edge[0]):
-                            if self.weighted:
-                                file.write(f"{vertex} {edge[0]} {edge[1]}\n")
-                            else:
-                                file.write(f"{vertex} {edge[0]}\n")
+                    batch.extend([f"{vertex} {neighbor}\n" for neighbor in neighbors])
+                if len(batch) >= batch_size:
+                    file.write(''.join(batch))
+                    line_count += len(batch)
+                    batch.clear()
+            file.write(''.join(batch))
+            line_count += len(batch)
+
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(filename)
+        return {
+            'lines': line_count,
+            'bytes': size,
+            'seconds': elapsed,
+            'bytes_per_second': size / elapsed if elapsed > 0 else float('inf'),
+        }
 
     def __str__(self):
         # Вывод графа в виде строки с указанием весов рёбер, включая петли
@@ -233,9 +1154,9 @@ class Graph:
         for vertex in self.adjacency_list:
             result += f"{vertex}: "
             if self.weighted:
-                edges = ", ".join(f"{adj} ({weight})" for adj, weight in self.adjacency_list[vertex])
+                edges = ", ".join(f"{adj} ({weight})" for adj, weight in self.adjacency_list[vertex].items())
             else:
-                edges = ", ".join(adj for adj, *_ in self.adjacency_list[vertex])
+                edges = ", ".join(self.adjacency_list[vertex])
             result += f"{edges}\n"
         return result
 
@@ -243,9 +1164,7 @@ class Graph:
         edge_list = []
         seen_edges = set()
         for vertex in self.adjacency_list:
-            for edge in self.adjacency_list[vertex]:
-                neighbor = edge[0]
-                weight = edge[1] if self.weighted else None
+            for neighbor, weight in self.adjacency_list[vertex].items():
                 if self.directed:
                     edge_repr = (vertex, neighbor, weight) if self.weighted else (vertex, neighbor)
                     edge_list.append(edge_repr)
@@ -260,6 +1179,9 @@ class Graph:
 
     # Функция для нахождения компонент связности
     def find_connected_components(self):
+        if self._csr is not None:
+            return self._csr.find_connected_components()
+
         visited = set()
         components = []
 
@@ -271,7 +1193,7 @@ class Graph:
                 if vertex not in visited:
                     visited.add(vertex)
                     component.append(vertex)
-                    for neighbor, *_ in self.adjacency_list[vertex]:
+                    for neighbor in self.adjacency_list[vertex]:
                         if neighbor not in visited:
                             queue.append(neighbor)
             return component
@@ -290,7 +1212,7 @@ class Graph:
         def dfs(vertex, component):
             visited.add(vertex)
             component.add(vertex)
-            for neighbor, _ in self.adjacency_list.get(vertex, []):
+            for neighbor in self.adjacency_list.get(vertex, {}):
                 if neighbor not in visited:
                     dfs(neighbor, component)
 
@@ -306,7 +1228,7 @@ class Graph:
         # Рёбра, не связанные с основной компонентой
         isolated_edges = []
         for u in self.adjacency_list:
-            for v, weight in self.adjacency_list[u]:
+            for v, weight in self.adjacency_list[u].items():
                 if u not in main_component or v not in main_component:
                     isolated_edges.append((u, v, weight) if self.weighted else (u, v))
 
@@ -318,14 +1240,10 @@ class Graph:
             print(f"Вершина {target_vertex} не существует в графе.")
             return []
 
-        indegrees = {vertex: 0 for vertex in graph.adjacency_list}
-
-        for vertex, neighbors in graph.adjacency_list.items():
-            for neighbor, *_ in neighbors:
-                indegrees[neighbor] += 1
-
-        target_indegree = indegrees[target_vertex]
-        result = [vertex for vertex, indegree in indegrees.items() if indegree < target_indegree]
+        # Полустепени захода поддерживаются при изменениях графа, поэтому рёбра не просматриваются;
+        # вершины перебираются в порядке списка смежности, как и выводились раньше
+        target_indegree = graph.in_degree(target_vertex)
+        result = [vertex for vertex in graph.adjacency_list if graph.in_degree(vertex) < target_indegree]
 
         print(f"Вершины с полустепенью захода меньше, чем у {target_vertex}: {result}")
         return result
@@ -336,10 +1254,7 @@ class Graph:
             print(f"Вершина {target_vertex} не существует в графе.")
             return []
 
-        incoming = []
-        for vertex, neighbors in graph.adjacency_list.items():
-            if any(neighbor == target_vertex for neighbor, *_ in neighbors):
-                incoming.append(vertex)
+        incoming = list(graph.in_neighbors(target_vertex))
 
         print(f"Вершины, которые направлены на {target_vertex}: {incoming}")
         return incoming
@@ -348,42 +1263,145 @@ class Graph:
     def remove_non_reciprocal_edges(graph):
         reciprocal_graph = Graph(directed=True, weighted=graph.weighted)
 
-        for vertex in graph.adjacency_list:
-            reciprocal_graph.add_vertex(vertex)
-
-        for vertex in graph.adjacency_list:
-            for neighbor, *edge_data in graph.adjacency_list[vertex]:
-                # Проверяем, существует ли обратное ребро
-                if neighbor in graph.adjacency_list and any(v == vertex for v, *_ in graph.adjacency_list[neighbor]):
-                    if graph.weighted:
-                        reciprocal_graph.add_edge(vertex, neighbor, weight=edge_data[0])
-                    else:
-                        reciprocal_graph.add_edge(vertex, neighbor)
+        reciprocal_graph.add_vertices_from(graph.adjacency_list)
+        # Оставляем только рёбра, для которых существует обратное ребро
+        reciprocal_graph.add_edges_from(
+            (vertex, neighbor, weight)
+            for vertex in graph.adjacency_list
+            for neighbor, weight in graph.adjacency_list[vertex].items()
+            if neighbor in graph.adjacency_list and vertex in graph.adjacency_list[neighbor]
+        )
 
         print("Построен новый граф с удалением непарных дуг.")
         return reciprocal_graph
 
     # Задание 4: Все пути из u в v с помощью DFS
     def dfs_all_paths(self, u, v, path=None, all_paths=None):
-        if path is None:
-            path = []
         if all_paths is None:
             all_paths = []
+        all_paths.extend(self._iter_paths(u, v, path or []))
+        return all_paths
 
-        path.append(u)
+    def iter_all_paths(self, u, v, max_hops=None):
+        """
+        Генератор всех простых путей из u в v в том же порядке, что и dfs_all_paths.
+        Пути выдаются по одному, поэтому перебор можно прервать в любой момент.
+        max_hops ограничивает число рёбер в пути.
+        """
+        return self._iter_paths(u, v, [], max_hops)
 
-        if u == v:
-            all_paths.append(list(path))
+    def find_paths(self, u, v, max_hops=None, max_paths=None, time_limit=None):
+        """
+        Ограниченный перебор простых путей из u в v: не длиннее max_hops рёбер,
+        не больше max_paths путей и не дольше time_limit секунд.
+        Возвращает (пути, truncated): truncated=True, если перебор остановлен по max_paths
+        или time_limit и найдены не все пути.
+        """
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        search = self._iter_paths(u, v, [], max_hops, deadline, self._distances_to(v))
+        paths = []
+        while True:
+            try:
+                path = next(search)
+            except StopIteration as stop:
+                return paths, bool(stop.value)  # Генератор возвращает True при истечении времени
+            if max_paths is not None and len(paths) >= max_paths:
+                search.close()
+                return paths, True  # Есть ещё хотя бы один путь сверх max_paths
+            paths.append(path)
+
+    def count_paths(self, u, v, max_hops=None, time_limit=None):
+        """
+        Считает простые пути из u в v без построения самих путей. Вершины, из которых v
+        недостижима, отсекаются заранее (обратный обход в ширину от v).
+        Возвращает (количество, truncated): truncated=True, если подсчёт прерван по time_limit.
+        """
+        deadline = None if time_limit is None else time.monotonic() + time_limit
+        search = self._iter_paths(u, v, [], max_hops, deadline, self._distances_to(v), materialize=False)
+        count = 0
+        while True:
+            try:
+                next(search)
+            except StopIteration as stop:
+                return count, bool(stop.value)
+            count += 1
+
+    def _distances_to(self, target):
+        """
+        Расстояния в рёбрах от вершин до target (обратный обход в ширину).
+        Вершин, из которых target недостижима, в словаре нет.
+        """
+        distances = {target: 0}
+        if target not in self.adjacency_list:
+            return distances
+        if self.directed and self.reverse_adjacency is None:
+            # Обратных списков нет (граф заморожен или они отключены) — строим их один раз
+            reverse = defaultdict(list)
+            for vertex, neighbors in self.adjacency_list.items():
+                for neighbor in neighbors:
+                    reverse[neighbor].append(vertex)
+            predecessors = lambda vertex: reverse.get(vertex, ())
         else:
-            for neighbor, *_ in self.adjacency_list.get(u, []):
-                if neighbor not in path:
-                    self.dfs_all_paths(neighbor, v, path, all_paths)
+            predecessors = self.in_neighbors
 
-        path.pop()
-        return all_paths
+        queue = deque([target])
+        while queue:
+            vertex = queue.popleft()
+            for predecessor in predecessors(vertex):
+                if predecessor not in distances:
+                    distances[predecessor] = distances[vertex] + 1
+                    queue.append(predecessor)
+        return distances
+
+    def _iter_paths(self, u, v, prefix, max_hops=None, deadline=None, distances=None, materialize=True):
+        """
+        Обход в глубину без рекурсии: стек итераторов по соседям вершин текущего пути,
+        вершины пути хранятся ещё и в множестве для проверки за O(1).
+
+        distances — расстояния до v (см. _distances_to): вершины, из которых v недостижима
+        или недостижима за оставшиеся переходы, не посещаются. При materialize=False вместо
+        копий путей выдаётся True. Генератор возвращает True, если перебор прерван по deadline.
+        """
+        path = prefix + [u]
+        if u == v:
+            yield list(path) if materialize else True
+            return False
+        if max_hops is not None and max_hops < 1:
+            return False
+        on_path = set(path)
+        stack = [iter(self.adjacency_list.get(u, {}))]
+        steps = 0
+        while stack:
+            for neighbor in stack[-1]:
+                if neighbor in on_path:
+                    continue
+                if neighbor == v:
+                    yield path + [v] if materialize else True
+                    continue
+                # len(path) - len(prefix) — число рёбер пути до neighbor включительно
+                hops = len(path) - len(prefix)
+                if max_hops is not None and hops >= max_hops:
+                    continue
+                if distances is not None:
+                    remaining = distances.get(neighbor)
+                    if remaining is None or (max_hops is not None and hops + remaining > max_hops):
+                        continue
+                steps += 1
+                if deadline is not None and steps % 1024 == 0 and time.monotonic() > deadline:
+                    return True
+                path.append(neighbor)
+                on_path.add(neighbor)
+                stack.append(iter(self.adjacency_list.get(neighbor, {})))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+        return False
 
     # Задание 5: Нахождение центра графа (эксцентриситеты и радиус графа)
     def bfs_eccentricity(self, start):
+        if self._csr is not None:
+            return self._csr.bfs_eccentricity(start)
 
         distances = {vertex: float('inf') for vertex in self.adjacency_list}
         distances[start] = 0
@@ -394,7 +1412,7 @@ class Graph:
             vertex = queue.popleft()
             current_distance = distances[vertex]
 
-            for neighbor, *_ in self.adjacency_list[vertex]:
+            for neighbor in self.adjacency_list[vertex]:
                 if distances[neighbor] == float('inf'):
                     distances[neighbor] = current_distance + 1
                     queue.append(neighbor)
@@ -403,6 +1421,9 @@ class Graph:
         return eccentricity
 
     def find_graph_center(self):
+        return self._cached('find_graph_center', (), self._find_graph_center)
+
+    def _find_graph_center(self):
         eccentricities = {vertex: self.bfs_eccentricity(vertex) for vertex in self.adjacency_list}
         radius = min(eccentricities.values())
         center = [vertex for vertex, ecc in eccentricities.items() if ecc == radius]
@@ -415,6 +1436,9 @@ class Graph:
             print("Алгоритм Краскала применим только для взвешенных неориентированных графов.")
             return None
 
+        if self._csr is not None:
+            return self._csr.kruskal_mst()
+
         # Получаем список рёбер
         edges = self.edges()
         # Сортируем рёбра по весу
@@ -433,6 +1457,28 @@ class Graph:
 
     # Задание 7: Нахождение длину кратчайшего пути и всех путей такой длины
     def dijkstra(self, start):
+        return self.shortest_path_tree(start)
+
+    def shortest_path_tree(self, source):
+        """
+        Дерево кратчайших путей из source: (расстояния, предшественники на всех кратчайших путях).
+        Хранятся деревья для последних tree_cache_size источников; после изменения графа кэш очищается,
+        и запросы к новым целям из того же источника сводятся к восстановлению пути.
+        """
+        self._sync_tree_cache()
+        return self.tree_cache.get_or_compute((source, self.version), lambda: self._dijkstra(source))
+
+    def _sync_tree_cache(self):
+        # Деревья и отметки о частичных поисках относятся только к текущей версии графа
+        if self._tree_cache_version != self.version:
+            self.tree_cache.clear()
+            self._partial_tree_sources.clear()
+            self._tree_cache_version = self.version
+
+    def _dijkstra(self, start):
+        if self._csr is not None:
+            return self._csr.dijkstra(start)
+
         distances = {vertex: float('inf') for vertex in self.adjacency_list}
         distances[start] = 0
         priority_queue = [(0, start)]
@@ -444,8 +1490,8 @@ class Graph:
             if current_distance > distances[current_vertex]:
                 continue
 
-            for neighbor, weight in self.adjacency_list.get(current_vertex, []):
-                distance = current_distance + weight
+            for neighbor, weight in self.adjacency_list.get(current_vertex, {}).items():
+                distance = current_distance + (1 if weight is None else weight)
 
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
@@ -456,33 +1502,275 @@ class Graph:
 
         return distances, predecessors
 
+    def shortest_path(self, start, end, bidirectional=False):
+        """
+        Кратчайший путь из start в end: (путь, длина) или ([], inf), если пути нет.
+        Поиск останавливается, как только end извлечена из очереди; если дерево кратчайших
+        путей из start уже есть в кэше, путь восстанавливается по нему.
+        bidirectional=True — двунаправленный поиск: прямой по adjacency_list от start
+        и обратный по входящим рёбрам от end до встречи посередине.
+        """
+        if start not in self.adjacency_list or end not in self.adjacency_list:
+            return [], float('inf')
+        if (start, self.version) in self.tree_cache:
+            distances, predecessors = self.shortest_path_tree(start)
+            if distances[end] == float('inf'):
+                return [], float('inf')
+            # Через ребро нулевого веса start может оказаться в списке своих же предшественников
+            parents = {v: p[0] if p else None for v, p in predecessors.items()}
+            parents[start] = None
+            return self._walk_predecessors(parents, end), distances[end]
+        if bidirectional and (not self.directed or self.reverse_adjacency is not None):
+            return self._bidirectional_dijkstra(start, end)
+
+        distances = {start: 0}
+        predecessors = {start: None}
+        priority_queue = [(0, start)]
+        while priority_queue:
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_vertex == end:
+                return self._walk_predecessors(predecessors, end), current_distance
+            if current_distance > distances[current_vertex]:
+                continue
+            for neighbor, weight in self.adjacency_list[current_vertex].items():
+                distance = current_distance + (1 if weight is None else weight)
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (distance, neighbor))
+        return [], float('inf')
+
+    def _bidirectional_dijkstra(self, start, end):
+        # Прямой поиск идёт по исходящим рёбрам от start, обратный — по входящим от end.
+        # Поиск останавливается, когда сумма минимумов двух очередей не меньше лучшего найденного пути.
+        backward_adjacency = self.reverse_adjacency if self.directed else self.adjacency_list
+        searches = (
+            (self.adjacency_list, {start: 0}, {start: None}, [(0, start)]),
+            (backward_adjacency, {end: 0}, {end: None}, [(0, end)]),
+        )
+        best, meeting = (0, start) if start == end else (float('inf'), None)
+
+        while searches[0][3] and searches[1][3]:
+            if searches[0][3][0][0] + searches[1][3][0][0] >= best:
+                break
+            side = 0 if searches[0][3][0][0] <= searches[1][3][0][0] else 1
+            adjacency, distances, predecessors, priority_queue = searches[side]
+            other_distances = searches[1 - side][1]
+
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_distance > distances[current_vertex]:
+                continue
+            for neighbor, weight in adjacency[current_vertex].items():
+                distance = current_distance + (1 if weight is None else weight)
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (distance, neighbor))
+                    if neighbor in other_distances and distance + other_distances[neighbor] < best:
+                        best = distance + other_distances[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            return [], float('inf')
+        forward_path = self._walk_predecessors(searches[0][2], meeting)
+        backward_path = self._walk_predecessors(searches[1][2], meeting)
+        return forward_path + backward_path[-2::-1], best
+
+    @staticmethod
+    def _walk_predecessors(predecessors, end):
+        """Путь до end по словарю единственных предшественников (у начала пути предшественник None)."""
+        path = []
+        current = end
+        while current is not None:
+            path.append(current)
+            current = predecessors[current]
+        path.reverse()
+        return path
+
+    def _shortest_path_dag(self, start, end):
+        """
+        Расстояния и списки предшественников на всех кратчайших путях из start, достаточные для end.
+        Первый запрос из start при текущей версии графа останавливает поиск, когда все вершины
+        не дальше end извлечены из очереди (их списки предшественников уже полные). Повторный запрос
+        из того же источника строит полное дерево через shortest_path_tree, и дальше все цели
+        из этого источника обслуживаются из кэша деревьев.
+        """
+        self._sync_tree_cache()
+        if (self._csr is not None or (start, self.version) in self.tree_cache
+                or start in self._partial_tree_sources):
+            return self.shortest_path_tree(start)
+        self._partial_tree_sources.add(start)
+
+        distances = {start: 0}
+        predecessors = {start: []}
+        priority_queue = [(0, start)]
+        target_distance = float('inf')
+        while priority_queue:
+            current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_distance > target_distance:
+                break
+            if current_distance > distances[current_vertex]:
+                continue
+            if current_vertex == end:
+                target_distance = current_distance
+            for neighbor, weight in self.adjacency_list.get(current_vertex, {}).items():
+                distance = current_distance + (1 if weight is None else weight)
+                known = distances.get(neighbor, float('inf'))
+                if distance < known:
+                    distances[neighbor] = distance
+                    heapq.heappush(priority_queue, (distance, neighbor))
+                    predecessors[neighbor] = [current_vertex]
+                elif distance == known:
+                    predecessors[neighbor].append(current_vertex)
+        return distances, predecessors
+
+    def landmark_tables(self, count=8, method='farthest'):
+        """
+        Опорные вершины и таблицы расстояний до них для astar (см. Landmarks).
+        method='farthest' — каждая следующая вершина самая удалённая от уже выбранных,
+        method='degree' — вершины с наибольшей степенью исхода.
+        Таблицы хранятся в кэше результатов и пересчитываются после изменения графа.
+        """
+        seeds = [vertex for vertex, _ in self.out_degree_index.top(count)] if method == 'degree' else ()
+        return self._cached('landmarks', (count, method),
+                            lambda: Landmarks(self.adjacency_list, self.directed, count, method, seeds))
+
+    def astar(self, start, end, landmarks=8, method='farthest'):
+        """
+        Кратчайший путь из start в end алгоритмом A* с оценкой по опорным вершинам (ALT):
+        (путь, длина) или ([], inf), если пути нет. Таблицы строятся при первом запросе
+        (2 * landmarks запусков Дейкстры) и служат всем следующим запросам до изменения графа,
+        поэтому метод рассчитан на серии запросов к неизменяемому графу.
+        """
+        if start not in self.adjacency_list or end not in self.adjacency_list:
+            return [], float('inf')
+        estimate = self.landmark_tables(landmarks, method).heuristic(end)
+        if estimate(start) == float('inf'):
+            return [], float('inf')
+
+        distances = {start: 0}
+        predecessors = {start: None}
+        priority_queue = [(estimate(start), 0, start)]
+        while priority_queue:
+            _, current_distance, current_vertex = heapq.heappop(priority_queue)
+            if current_vertex == end:
+                return self._walk_predecessors(predecessors, end), current_distance
+            if current_distance > distances[current_vertex]:
+                continue
+            for neighbor, weight in self.adjacency_list[current_vertex].items():
+                distance = current_distance + (1 if weight is None else weight)
+                if distance < distances.get(neighbor, float('inf')):
+                    bound = estimate(neighbor)
+                    if bound == float('inf'):
+                        continue  # Из neighbor вершина end недостижима
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_vertex
+                    heapq.heappush(priority_queue, (distance + bound, distance, neighbor))
+        return [], float('inf')
+
     # Поиск всех кратчайших путей
     def find_all_shortest_paths(self, start, end):
-        distances, predecessors = self.dijkstra(start)
-        shortest_length = distances.get(end)
+        distances, predecessors = self._shortest_path_dag(start, end)
+        shortest_length = distances.get(end, float('inf'))
 
         if shortest_length == float('inf'):
             print(f"Путь из {start} в {end} не существует.")
             return [], float('inf')
 
-        def dfs(current, path):
-            if current == start:
-                result.append(path[::-1])
-                return
-            for predecessor in predecessors[current]:
-                dfs(predecessor, path + [current])
+        return list(self._iter_dag_paths(start, end, predecessors)), shortest_length
 
-        result = []
-        dfs(end, [])
-        return result, shortest_length
+    def shortest_paths_summary(self, start, end, max_paths=None):
+        """
+        Кратчайшие пути из start в end по одному поиску: (первые max_paths путей, длина, число путей).
+        Если пути нет — ([], inf, 0).
+        """
+        distances, predecessors = self._shortest_path_dag(start, end)
+        length = distances.get(end, float('inf'))
+        if length == float('inf'):
+            return [], length, 0
+        paths = list(itertools.islice(self._iter_dag_paths(start, end, predecessors), max_paths))
+        return paths, length, self._count_dag_paths(start, end, predecessors)
+
+    def iter_shortest_paths(self, start, end):
+        """
+        Генератор всех кратчайших путей из start в end по графу предшественников,
+        построенному dijkstra. Обход без рекурсии идёт от end к start по одному общему стеку
+        вершин; список создаётся только для выдаваемого пути.
+        """
+        distances, predecessors = self._shortest_path_dag(start, end)
+        if distances.get(end, float('inf')) == float('inf'):
+            return
+        yield from self._iter_dag_paths(start, end, predecessors)
+
+    @staticmethod
+    def _iter_dag_paths(start, end, predecessors):
+        """Простые пути из start в end по спискам предшественников (end должна быть достижима)."""
+        if end == start:
+            yield [start]
+            return
+
+        path = [end]  # Вершины от end до текущей
+        on_path = {end}  # Защита от циклов из рёбер нулевого веса
+        stack = [iter(predecessors[end])]
+        while stack:
+            for predecessor in stack[-1]:
+                if predecessor == start:
+                    yield [start] + path[::-1]
+                    continue
+                if predecessor in on_path:
+                    continue
+                path.append(predecessor)
+                on_path.add(predecessor)
+                stack.append(iter(predecessors[predecessor]))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+
+    def count_shortest_paths(self, start, end):
+        """
+        Количество кратчайших путей из start в end без их перечисления: динамическое
+        программирование по графу предшественников из dijkstra —
+        число путей до вершины равно сумме чисел путей до её предшественников.
+        Результат совпадает с числом путей из iter_shortest_paths. Если рёбра нулевого веса
+        образуют цикл среди кратчайших путей, динамика неприменима, и пути считаются перебором
+        (время растёт с их числом).
+        """
+        distances, predecessors = self._shortest_path_dag(start, end)
+        if distances.get(end, float('inf')) == float('inf'):
+            return 0
+        return self._count_dag_paths(start, end, predecessors)
+
+    def _count_dag_paths(self, start, end, predecessors):
+        counts = {start: 1}
+        entered = {start}  # Вершины, предшественники которых уже поставлены в стек
+        stack = [end]
+        while stack:
+            vertex = stack[-1]
+            if vertex in counts:
+                stack.pop()
+            elif vertex not in entered:
+                entered.add(vertex)
+                stack.extend(p for p in predecessors[vertex] if p not in entered)
+            else:
+                if any(p not in counts for p in predecessors[vertex]):
+                    # Предшественник, ещё не посчитанный к этому моменту, лежит на цикле нулевого веса:
+                    # простые пути через такой цикл динамикой не сосчитать
+                    return sum(1 for _ in self._iter_dag_paths(start, end, predecessors))
+                counts[vertex] = sum(counts[p] for p in predecessors[vertex])
+                stack.pop()
+        return counts[end]
 
     # Задание 8: Определить N-периферию для заданной вершины графа
     def floyd_warshall(self):
+        return self._cached('floyd_warshall', (), self._floyd_warshall)
+
+    def _floyd_warshall(self):
         # Инициализация матрицы расстояний
         distances = {u: {v: float('inf') for v in self.adjacency_list} for u in self.adjacency_list}
         for u in self.adjacency_list:
             distances[u][u] = 0
-            for v, weight in self.adjacency_list[u]:
+            for v, weight in self.adjacency_list[u].items():
                 distances[u][v] = weight
 
         # Основной цикл алгоритма Флойда-Уоршелла
@@ -501,6 +1789,12 @@ class Graph:
 
     # Задание 9: Вывести отрицательные циклы
     def bellman_ford(self, start):
+        return self._cached('bellman_ford', (start,), lambda: self._bellman_ford(start))
+
+    def _bellman_ford(self, start):
+        if self._csr is not None:
+            return self._csr.bellman_ford(start)
+
         distances = {vertex: float('inf') for vertex in self.adjacency_list}
         predecessors = {vertex: None for vertex in self.adjacency_list}
         distances[start] = 0
@@ -508,7 +1802,7 @@ class Graph:
         # Основной цикл алгоритма Беллмана-Форда
         for _ in range(len(self.adjacency_list) - 1):
             for u in self.adjacency_list:
-                for v, weight in self.adjacency_list[u]:
+                for v, weight in self.adjacency_list[u].items():
                     if distances[u] + weight < distances[v]:
                         distances[v] = distances[u] + weight
                         predecessors[v] = u
@@ -516,21 +1810,37 @@ class Graph:
         # Проверка на наличие отрицательных циклов
         negative_cycles = []
         for u in self.adjacency_list:
-            for v, weight in self.adjacency_list[u]:
+            for v, weight in self.adjacency_list[u].items():
                 if distances[u] + weight < distances[v]:
                     # Восстанавливаем отрицательный цикл
                     cycle = []
                     current = v
                     visited = set()
-                    while current not in visited:
+                    # Цепочка предшественников может дойти до start (у него предшественника нет)
+                    while current is not None and current not in visited:
                         visited.add(current)
                         cycle.append(current)
                         current = predecessors[current]
-                    cycle.append(current)
+                    if current is not None:
+                        cycle.append(current)
                     cycle.reverse()
                     negative_cycles.append(cycle)
         return negative_cycles
 
+    def all_negative_cycles(self):
+        """
+        Запускает алгоритм Беллмана-Форда из каждой вершины и возвращает множество
+        найденных отрицательных циклов (каждый цикл — отсортированный кортеж вершин).
+        """
+        return self._cached('all_negative_cycles', (), self._all_negative_cycles)
+
+    def _all_negative_cycles(self):
+        all_cycles = set()
+        for start in self.adjacency_list:
+            for cycle in self._bellman_ford(start):
+                all_cycles.add(tuple(sorted(cycle)))
+        return all_cycles
+
     # Задание 10: Найти максимальный поток
     def edmonds_karp_max_flow(self, source, sink):
         source = source.strip()
@@ -542,14 +1852,19 @@ class Graph:
         if not self.directed:
             print("Алгоритм Эдмондса-Карпа применим только к ориентированным графам.")
             return None
+
+        if self._csr is not None:
+            return self._csr.edmonds_karp_max_flow(source, sink)
+
         # Структура для хранения остаточной ёмкости
         residual_capacity = {u: {} for u in self.adjacency_list}
         for u in self.adjacency_list:
-            for v, capacity in self.adjacency_list[u]:
+            for v, capacity in self.adjacency_list[u].items():
                 residual_capacity[u][v] = capacity if self.weighted else 1
                 if v not in residual_capacity:
                     residual_capacity[v] = {}  # Для обратного пути
-                residual_capacity[v][u] = 0  # Обратное ребро с нулевой ёмкостью
+                # Обратное ребро с нулевой ёмкостью, если встречной дуги v->u нет (её ёмкость не затираем)
+                residual_capacity[v].setdefault(u, 0)
 
         def bfs_find_augmenting_path():
             parent = {u: None for u in self.adjacency_list}
@@ -7,6 +7,9 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import random
 
 class GraphApp:
+    MAX_SHOWN_PATHS = 100  # Сколько путей показывать в окне результата
+    PATHS_TIME_LIMIT = 2.0  # Сколько секунд искать пути, чтобы не блокировать интерфейс
+
     def __init__(self, root):
         self.root = root
         self.root.title("Графический интерфейс для работы с графами")
@@ -90,8 +93,8 @@ class GraphApp:
         self.ax.axis("off")
 
         if self.graph:
-            # Преобразуем ваш граф в объект NetworkX
-            self.nx_graph = self.graph.to_networkx()
+            # Преобразуем ваш граф в объект NetworkX (повторно используется, пока граф не изменился)
+            self.nx_graph = self.graph.to_networkx(cache=True)
             pos = nx.spring_layout(self.nx_graph)
 
             # Рисуем вершины и ребра
@@ -133,8 +136,8 @@ class GraphApp:
         self.ax.axis("off")
 
         if self.graph:
-            # Преобразуем граф в объект NetworkX
-            self.nx_graph = self.graph.to_networkx()
+            # Преобразуем граф в объект NetworkX (повторно используется, пока граф не изменился)
+            self.nx_graph = self.graph.to_networkx(cache=True)
 
             # Используем сохраненные позиции
             nx.draw(
@@ -264,8 +267,14 @@ class GraphApp:
         u = simpledialog.askstring("Все пути (DFS)", "Введите начальную вершину:")
         v = simpledialog.askstring("Все пути (DFS)", "Введите конечную вершину:")
         if u and v:
-            paths = self.graph.dfs_all_paths(u, v)
-            messagebox.showinfo("Результат", f"Все пути от {u} до {v}: {paths}")
+            # Перебор ограничен числом путей и временем, чтобы окно не зависало на плотных графах
+            paths, truncated = self.graph.find_paths(u, v, max_paths=self.MAX_SHOWN_PATHS,
+                                                     time_limit=self.PATHS_TIME_LIMIT)
+            if truncated:
+                messagebox.showinfo("Результат", f"Найдено {len(paths)} путей от {u} до {v} "
+                                                 f"(показаны не все): {paths}")
+            else:
+                messagebox.showinfo("Результат", f"Все пути от {u} до {v}: {paths}")
 
     def find_graph_center(self):
         if not self.ensure_graph_loaded():
@@ -298,9 +307,12 @@ class GraphApp:
             return
 
         try:
-            paths, length = self.graph.find_all_shortest_paths(u, v)
-            if paths:
+            # Длина, число путей (без их перечисления) и первые пути — по одному поиску
+            paths, length, count = self.graph.shortest_paths_summary(u, v, self.MAX_SHOWN_PATHS)
+            if count:
                 result = "\n".join([f"{' -> '.join(path)}" for path in paths])
+                if count > self.MAX_SHOWN_PATHS:
+                    result += f"\n(показаны {self.MAX_SHOWN_PATHS} из {count})"
                 messagebox.showinfo("Результат", f"Длина: {length}\nПуть:\n{result}")
             else:
                 messagebox.showinfo("Результат", f"Путь из {u} в {v} не существует.")
@@ -329,13 +341,8 @@ class GraphApp:
         if not self.ensure_graph_loaded():
             return
         try:
-            all_cycles = set()  # Используем множество для хранения уникальных циклов
-            for start in self.graph.adjacency_list:
-                cycles = self.graph.bellman_ford(start)
-                for cycle in cycles:
-                    # Преобразуем цикл в кортеж с сортировкой для уникальности
-                    normalized_cycle = tuple(sorted(cycle))
-                    all_cycles.add(normalized_cycle)
+            # Результат кэшируется в графе до его следующего изменения
+            all_cycles = self.graph.all_negative_cycles()
 
             if all_cycles:
                 result = "\n".join([f"Цикл: {cycle}" for cycle in all_cycles])
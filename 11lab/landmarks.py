@@ -0,0 +1,122 @@
+from array import array
+import heapq
+
+INF = float('inf')
+
+
+def _index_rows(adjacency, index):
+    """Списки смежности по номерам вершин: [(номер соседа, вес), ...]; вес None считается единичным."""
+    return [[(index[neighbor], 1 if weight is None else weight) for neighbor, weight in adjacency[vertex].items()]
+            for vertex in index]
+
+
+def _reverse_rows(rows):
+    reverse = [[] for _ in rows]
+    for u, row in enumerate(rows):
+        for v, weight in row:
+            reverse[v].append((u, weight))
+    return reverse
+
+
+def _distances(rows, source):
+    """Расстояния от source до всех вершин (алгоритм Дейкстры) в массиве array('d'); недостижимые — inf."""
+    distances = array('d', [INF]) * len(rows)
+    distances[source] = 0
+    priority_queue = [(0, source)]
+    while priority_queue:
+        current_distance, u = heapq.heappop(priority_queue)
+        if current_distance > distances[u]:
+            continue
+        for v, weight in rows[u]:
+            distance = current_distance + weight
+            if distance < distances[v]:
+                distances[v] = distance
+                heapq.heappush(priority_queue, (distance, v))
+    return distances
+
+
+class Landmarks:
+    """
+    Опорные вершины (landmarks) и таблицы расстояний для эвристики A* (ALT).
+    forward[k][i] — расстояние от k-й опорной вершины до вершины с номером i,
+    backward[k][i] — от вершины i до опорной (для неориентированного графа это те же таблицы).
+    Таблицы хранятся в array('d'): 8 байт на вершину и опорную вершину.
+    """
+
+    def __init__(self, adjacency, directed, count, method='farthest', seeds=()):
+        self.vertices = list(adjacency)
+        self.index = {vertex: i for i, vertex in enumerate(self.vertices)}
+        self.landmarks = []
+        self.forward = []
+        self.backward = []
+        if not self.vertices or count <= 0:
+            return
+
+        rows = _index_rows(adjacency, self.index)
+        reverse_rows = _reverse_rows(rows) if directed else None
+        if method == 'degree':
+            candidates = [self.index[vertex] for vertex in seeds][:count]
+        elif method == 'farthest':
+            candidates = None
+        else:
+            raise ValueError(f"Неизвестный способ выбора опорных вершин: '{method}'")
+
+        # Выбор самой удалённой вершины: следующая опорная вершина — та, что дальше всего
+        # от уже выбранных (недостижимые считаются самыми удалёнными, так покрываются все компоненты).
+        # Первая — самая удалённая от первой вершины графа.
+        nearest = _distances(rows, 0)
+        chosen = set()
+        while len(self.landmarks) < count:
+            if candidates is not None:
+                if len(self.landmarks) == len(candidates):
+                    break
+                landmark = candidates[len(self.landmarks)]
+            else:
+                landmark = max(range(len(rows)), key=nearest.__getitem__)
+                if landmark in chosen:
+                    break  # Все вершины уже опорные
+            chosen.add(landmark)
+            forward = _distances(rows, landmark)
+            self.landmarks.append(self.vertices[landmark])
+            self.forward.append(forward)
+            self.backward.append(_distances(reverse_rows, landmark) if directed else forward)
+            if candidates is None:
+                if len(self.landmarks) == 1:
+                    nearest = array('d', forward)
+                else:
+                    for i, distance in enumerate(forward):
+                        if distance < nearest[i]:
+                            nearest[i] = distance
+                for i in chosen:
+                    nearest[i] = -1
+
+    def nbytes(self):
+        tables = {id(table): table for table in self.forward + self.backward}
+        return sum(table.itemsize * len(table) for table in tables.values())
+
+    def heuristic(self, target):
+        """
+        Функция нижней оценки расстояния от вершины до target по неравенству треугольника:
+        d(v, t) >= d(L, t) - d(L, v) и d(v, t) >= d(v, L) - d(t, L) для каждой опорной вершины L.
+        Оценка inf означает, что target из вершины недостижима.
+        """
+        t = self.index[target]
+        # Слагаемые с бесконечным расстоянием от target не дают оценки (и дали бы inf - inf)
+        terms_from = [(table, table[t]) for table in self.forward if table[t] != INF]
+        terms_to = [(table, table[t]) for table in self.backward if table[t] != INF]
+        index = self.index
+
+        def estimate(vertex):
+            i = index[vertex]
+            bound = 0
+            for table, landmark_to_target in terms_from:
+                difference = landmark_to_target - table[i]
+                if difference > bound:
+                    bound = difference
+            for table, target_to_landmark in terms_to:
+                difference = table[i] - target_to_landmark
+                if difference > bound:
+                    bound = difference
+            return bound
+
+        return estimate
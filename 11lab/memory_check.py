@@ -0,0 +1,69 @@
+"""
+Проверка расхода памяти на запись ребра (Graph.memory_usage) для всех представлений графа.
+
+Для каждого типа графа строится один и тот же случайный граф (VERTICES вершин, EDGES рёбер,
+фиксированное зерно) и его расход сравнивается с замеренным значением из REFERENCE_BYTES_PER_EDGE.
+Компактное представление графа — только замороженное CSR (freeze); изменяемые словари смежности
+памяти не экономят, для них проверка лишь ловит рост расхода.
+Запуск из каталога 11lab: python memory_check.py. Код возврата 1, если хотя бы одно значение
+выросло больше чем на TOLERANCE. Размеры словарей зависят от версии CPython; эталон замерен на CPython 3.11.
+"""
+import os
+import random
+import sys
+
+# graph.py импортирует disjoint_set из 7lab
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, '7lab'))
+
+from graph import Graph
+
+VERTICES = 20000
+EDGES = 200000
+SEED = 6
+TOLERANCE = 0.05
+
+# (ориентированный, взвешенный, обратные списки) -> (байт на ребро в словарях, байт на ребро в CSR).
+# Вес невзвешенного графа в словаре — ссылка на общий None (отдельных объектов нет),
+# в CSR массив весов у невзвешенного графа отсутствует.
+REFERENCE_BYTES_PER_EDGE = {
+    (True, True, True): (97.4, 15.7),
+    (True, True, False): (60.7, 15.7),
+    (True, False, True): (73.4, 7.7),
+    (True, False, False): (36.7, 7.7),
+    (False, True, True): (42.7, 13.8),
+    (False, False, True): (30.7, 5.8),
+}
+
+
+def measure(directed, weighted, track_incoming):
+    """Байт на запись ребра для эталонного графа: (в словарях смежности, после freeze)."""
+    rng = random.Random(SEED)
+    edges = [(str(rng.randrange(VERTICES)), str(rng.randrange(VERTICES)), float(rng.randint(1, 100)))
+             for _ in range(EDGES)]
+    graph = Graph(directed=directed, weighted=weighted, track_incoming=track_incoming)
+    graph.add_vertices_from(str(i) for i in range(VERTICES))
+    graph.add_edges_from(edges if weighted else [edge[:2] for edge in edges])
+    dict_bytes = graph.memory_usage()['bytes_per_edge']
+    graph.freeze()
+    return dict_bytes, graph.memory_usage()['bytes_per_edge']
+
+
+def main():
+    failed = False
+    print("ориент.  взвеш.  обратные  словари (эталон)  CSR (эталон)")
+    for (directed, weighted, track_incoming), reference in REFERENCE_BYTES_PER_EDGE.items():
+        measured = measure(directed, weighted, track_incoming)
+        marks = []
+        for value, limit in zip(measured, reference):
+            regressed = value > limit * (1 + TOLERANCE)
+            failed = failed or regressed
+            marks.append(f"{value:6.1f} ({limit:5.1f}){' !' if regressed else '  '}")
+        print(f"{'да' if directed else 'нет':8} {'да' if weighted else 'нет':7} "
+              f"{'да' if track_incoming else 'нет':9} {marks[0]:17} {marks[1]}")
+    if failed:
+        print(f"Расход памяти вырос больше чем на {TOLERANCE:.0%} (отмечено '!').")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import os
+
+# Формат журнала — по одной записи на строку, в том же текстовом виде, что и файл графа:
+#   +v вершина         добавление вершины
+#   -v вершина         удаление вершины вместе с её рёбрами
+#   +e u v [вес]       добавление ребра или замена его веса
+#   -e u v             удаление ребра
+# Все записи — присваивания, поэтому повторное применение журнала к графу,
+# к которому он уже был применён, не меняет граф.
+
+
+def format_record(operation, args):
+    """Строка журнала для записи журнала изменений графа (операция, *аргументы) или None."""
+    if operation == 'add_vertex':
+        return f"+v {args[0]}\n"
+    if operation == 'remove_vertex':
+        return f"-v {args[0]}\n"
+    if operation in ('add_edge', 'set_weight'):
+        u, v, weight = args[0], args[1], args[-1]  # Для set_weight последний аргумент — новый вес
+        return f"+e {u} {v}\n" if weight is None else f"+e {u} {v} {weight}\n"
+    if operation == 'remove_edge':
+        return f"-e {args[0]} {args[1]}\n"
+    return None
+
+
+def read_log(filename):
+    """
+    Читает журнал и возвращает пары (операция, аргументы). Последняя строка без перевода
+    строки считается недописанной (сбой во время записи) и пропускается.
+    """
+    with open(filename, 'r') as file:
+        for line in file:
+            if not line.endswith('\n'):
+                return
+            parts = line.split()
+            if not parts:
+                continue
+            kind = parts[0]
+            if kind == '+v':
+                yield 'add_vertex', (parts[1],)
+            elif kind == '-v':
+                yield 'remove_vertex', (parts[1],)
+            elif kind == '+e':
+                yield 'add_edge', (parts[1], parts[2], float(parts[3]) if len(parts) > 3 else None)
+            elif kind == '-e':
+                yield 'remove_edge', (parts[1], parts[2])
+            else:
+                raise ValueError(f"Неизвестная запись журнала: '{line.strip()}'")
+
+
+class MutationLog:
+    """
+    Журнал изменений графа, дописываемый в конец файла. Записи сбрасываются на диск (fsync)
+    пачками: после каждых sync_every записей, при вызове sync() и при закрытии.
+    """
+
+    def __init__(self, filename, sync_every=64):
+        self.filename = filename
+        self.sync_every = sync_every
+        self._file = open(filename, 'a')
+        self._pending = 0  # Записи, ещё не сброшенные на диск
+
+    def append(self, operation, args):
+        line = format_record(operation, args)
+        if line is None:
+            return
+        self._file.write(line)
+        self._pending += 1
+        if self._pending >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+
+    def clear(self):
+        """Очищает журнал (после того как его изменения перенесены в основной файл)."""
+        self._file.flush()
+        self._file.truncate(0)
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        self.sync()
+        self._file.close()
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """
+    Грубая оценка размера результата в элементах: количество вложенных элементов
+    в словарях, списках, кортежах и множествах.
+    """
+    if isinstance(value, dict):
+        return 1 + sum(1 + estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 1 + sum(estimate_size(item) for item in value)
+    return 1
+
+
+class ResultCache:
+    """
+    Кэш результатов алгоритмов с вытеснением давно неиспользованных записей (LRU).
+
+    Вытеснение происходит, когда число записей превышает max_entries или суммарный
+    размер результатов (по estimate_size) превышает max_size. Ограничение равное None отключено.
+    """
+
+    def __init__(self, max_entries=32, max_size=None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries = OrderedDict()  # Ключ -> (результат, размер)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_or_compute(self, key, compute):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        if self.max_entries == 0:
+            return
+        size = estimate_size(value) if self.max_size is not None else 1
+        if self.max_size is not None and size > self.max_size:
+            return  # Результат больше всего кэша — не храним его
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._entries[key] = (value, size)
+        self.size += size
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_size is not None and self.size > self.max_size)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+
+    def copy(self):
+        """Новый кэш с теми же ограничениями и записями (сами результаты общие), счётчики с нуля."""
+        clone = ResultCache(max_entries=self.max_entries, max_size=self.max_size)
+        clone._entries = OrderedDict(self._entries)
+        clone.size = self.size
+        return clone
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'size': self.size,
+        }
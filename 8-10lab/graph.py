@@ -1,4 +1,5 @@
 from disjoint_set import DisjointSet
+from degree_index import DegreeIndex
 from collections import defaultdict, deque
 import heapq
 
@@ -10,6 +11,59 @@ class Graph:
             self.adjacency_list = {v: list(adj) for v, adj in adjacency_list.items()}
         self.directed = directed
         self.weighted = weighted  # Атрибут для определения взвешенности графа
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        # Все структуры построены заново и принадлежат только этому графу
+        self._shared = False
+        self._owned_rows = None
+        # Индекс полустепеней захода поддерживается при изменениях графа (см. vertices_with_lower_indegree)
+        self._rebuild_in_degree_index()
+
+    def copy(self):
+        """
+        Создаёт снимок графа за O(1) по принципу копирования при записи (copy-on-write).
+        Снимок и исходный граф разделяют словарь смежности, списки соседей и индекс полустепеней;
+        при первом изменении в любом из них копируются словарь и индекс, а списки соседей —
+        только у тех вершин, которые изменяются.
+        """
+        self._mark_shared()
+        snapshot = Graph.__new__(Graph)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot._mark_shared()
+        return snapshot
+
+    def _mark_shared(self):
+        self._shared = True
+        self._owned_rows = set()  # Вершины, списки соседей которых уже скопированы этим графом
+
+    def _begin_write(self):
+        """Отделяет словарь смежности и индекс полустепеней, общие со снимком."""
+        if self._shared:
+            self.adjacency_list = dict(self.adjacency_list)
+            self.in_degree_index = self.in_degree_index.copy()
+            self._shared = False
+
+    def _row(self, vertex):
+        """Список соседей вершины, пригодный для изменения (копируется при первой записи после снимка)."""
+        neighbors = self.adjacency_list[vertex]
+        if self._owned_rows is not None and vertex not in self._owned_rows:
+            neighbors = self.adjacency_list[vertex] = list(neighbors)
+            self._owned_rows.add(vertex)
+        return neighbors
+
+    def _rebuild_in_degree_index(self):
+        indegrees = {vertex: 0 for vertex in self.adjacency_list}
+        for neighbors in self.adjacency_list.values():
+            for neighbor, *_ in neighbors:
+                if neighbor in indegrees:
+                    indegrees[neighbor] += 1
+        self.in_degree_index = DegreeIndex()
+        for vertex, indegree in indegrees.items():
+            self.in_degree_index.add(vertex, indegree)
+
+    def in_degree(self, vertex):
+        return self.in_degree_index.degree(vertex)
 
     def load_from_file(self, filename):
         with open(filename, 'r') as file:
@@ -55,6 +109,7 @@ class Graph:
 
         # Копируем данные из self.graph в self.adjacency_list для дальнейшего использования
         self.adjacency_list = self.graph.copy()
+        self._rebuild_indexes()
 
         # Вывод содержимого графа:
         print(f"Граф из файла '{filename}' загружен. Вот его содержимое:")
@@ -90,7 +145,11 @@ class Graph:
 
     def add_vertex(self, vertex):
         if vertex not in self.adjacency_list:
+            self._begin_write()
             self.adjacency_list[vertex] = []
+            if self._owned_rows is not None:
+                self._owned_rows.add(vertex)
+            self.in_degree_index.add(vertex)
         else:
             print(f"Вершина {vertex} уже существует.")
 
@@ -111,25 +170,26 @@ class Graph:
         # Проверяем существование ребра
         existing_edge = next(((i, w) for i, (neighbor, *w) in enumerate(self.adjacency_list[u]) if neighbor == v),
                              None)
+        if existing_edge and not overwrite:
+            print(f"Ребро {u}-{v} уже существует.")
+            return False  # Указывает, что ребро уже существует и не было перезаписано
 
+        self._begin_write()
         if existing_edge:
-            if overwrite:
-                index, _ = existing_edge
-                if self.weighted:
-                    self.adjacency_list[u][index] = (v, weight)
-                else:
-                    self.adjacency_list[u][index] = (v,)  # Для невзвешенного графа
-                print(f"Ребро {u}-{v} обновлено.")
+            index, _ = existing_edge
+            if self.weighted:
+                self._row(u)[index] = (v, weight)
             else:
-                print(f"Ребро {u}-{v} уже существует.")
-                return False  # Указывает, что ребро уже существует и не было перезаписано
+                self._row(u)[index] = (v,)  # Для невзвешенного графа
+            print(f"Ребро {u}-{v} обновлено.")
         else:
             if self.weighted:
-                self.adjacency_list[u].append((v, weight))
+                self._row(u).append((v, weight))
                 print(f"Ребро {u}-{v} добавлено с весом {weight}.")
             else:
-                self.adjacency_list[u].append((v,))
+                self._row(u).append((v,))
                 print(f"Ребро {u}-{v} добавлено.")
+            self.in_degree_index.change(v, 1)
 
         if not self.directed and u != v:
             existing_reverse_edge = next(
@@ -137,49 +197,47 @@ class Graph:
             if existing_reverse_edge:
                 if overwrite and self.weighted:
                     index, _ = existing_reverse_edge
-                    self.adjacency_list[v][index] = (u, weight)
+                    self._row(v)[index] = (u, weight)
             else:
                 if self.weighted:
-                    self.adjacency_list[v].append((u, weight))
+                    self._row(v).append((u, weight))
                 else:
-                    self.adjacency_list[v].append((u,))
+                    self._row(v).append((u,))
+                self.in_degree_index.change(u, 1)
 
         return True  # Указывает, что ребро было успешно добавлено или обновлено
 
     def remove_vertex(self, vertex):
         if vertex in self.adjacency_list:
-            # Удаляем все рёбра, связанные с этой вершиной
-            self.adjacency_list.pop(vertex)
+            self._begin_write()
+            # Удаляем все рёбра, связанные с этой вершиной (записи рёбер остаются кортежами)
+            for neighbor, *_ in self.adjacency_list.pop(vertex):
+                if neighbor != vertex:
+                    self.in_degree_index.change(neighbor, -1)
+            self.in_degree_index.remove(vertex)
             for adj in self.adjacency_list:
-                if self.weighted:
-                    self.adjacency_list[adj] = [(v, w) for v, w in self.adjacency_list[adj] if v != vertex]
-                else:
-                    self.adjacency_list[adj] = [v for v, *_ in self.adjacency_list[adj] if v != vertex]
+                self.adjacency_list[adj] = [edge for edge in self.adjacency_list[adj] if edge[0] != vertex]
+            self._owned_rows = None  # Все списки соседей только что построены заново
         else:
             print(f"Вершина {vertex} не существует.")
 
     def remove_edge(self, u, v):
         if u in self.adjacency_list:
-            if self.weighted:
-                original_length = len(self.adjacency_list[u])
-                self.adjacency_list[u] = [(x, w) for x, w in self.adjacency_list[u] if x != v]
-                if len(self.adjacency_list[u]) < original_length:
-                    print(f"Ребро {u}-{v} удалено.")
-                else:
-                    print(f"Ребро {u}-{v} не существует.")
+            # Списки соседей строятся заново, поэтому копировать их при снимке не нужно
+            self._begin_write()
+            original_length = len(self.adjacency_list[u])
+            self.adjacency_list[u] = [edge for edge in self.adjacency_list[u] if edge[0] != v]
+            removed = original_length - len(self.adjacency_list[u])
+            if removed:
+                self.in_degree_index.change(v, -removed)
+                print(f"Ребро {u}-{v} удалено.")
             else:
-                original_length = len(self.adjacency_list[u])
-                self.adjacency_list[u] = [x for x, *_ in self.adjacency_list[u] if x != v]
-                if len(self.adjacency_list[u]) < original_length:
-                    print(f"Ребро {u}-{v} удалено.")
-                else:
-                    print(f"Ребро {u}-{v} не существует.")
+                print(f"Ребро {u}-{v} не существует.")
 
             if not self.directed:
-                if self.weighted:
-                    self.adjacency_list[v] = [(x, w) for x, w in self.adjacency_list[v] if x != u]
-                else:
-                    self.adjacency_list[v] = [x for x, *_ in self.adjacency_list[v] if x != u]
+                original_length = len(self.adjacency_list[v])
+                self.adjacency_list[v] = [edge for edge in self.adjacency_list[v] if edge[0] != u]
+                self.in_degree_index.change(u, len(self.adjacency_list[v]) - original_length)
         else:
             print(f"Вершина {u} не существует.")
 
@@ -297,14 +355,10 @@ class Graph:
             print(f"Вершина {target_vertex} не существует в графе.")
             return []
 
-        indegrees = {vertex: 0 for vertex in graph.adjacency_list}
-
-        for vertex, neighbors in graph.adjacency_list.items():
-            for neighbor, *_ in neighbors:
-                indegrees[neighbor] += 1
-
-        target_indegree = indegrees[target_vertex]
-        result = [vertex for vertex, indegree in indegrees.items() if indegree < target_indegree]
+        # Полустепени захода поддерживаются при изменениях графа, поэтому рёбра не просматриваются;
+        # вершины перебираются в порядке списка смежности, как и выводились раньше
+        target_indegree = graph.in_degree(target_vertex)
+        result = [vertex for vertex in graph.adjacency_list if graph.in_degree(vertex) < target_indegree]
 
         print(f"Вершины с полустепенью захода меньше, чем у {target_vertex}: {result}")
         return result
@@ -344,22 +398,41 @@ class Graph:
 
     # Задание 4: Все пути из u в v с помощью DFS
     def dfs_all_paths(self, u, v, path=None, all_paths=None):
-        if path is None:
-            path = []
         if all_paths is None:
             all_paths = []
+        all_paths.extend(self._iter_paths(u, v, path or []))
+        return all_paths
 
-        path.append(u)
-
+    def iter_all_paths(self, u, v):
+        """
+        Генератор всех простых путей из u в v в том же порядке, что и dfs_all_paths.
+        Пути выдаются по одному, поэтому перебор можно прервать в любой момент.
+        """
+        return self._iter_paths(u, v, [])
+
+    def _iter_paths(self, u, v, prefix):
+        # Обход в глубину без рекурсии: стек итераторов по соседям вершин текущего пути,
+        # вершины пути хранятся ещё и в множестве для проверки за O(1)
+        path = prefix + [u]
         if u == v:
-            all_paths.append(list(path))
-        else:
-            for neighbor, *_ in self.adjacency_list.get(u, []):
-                if neighbor not in path:
-                    self.dfs_all_paths(neighbor, v, path, all_paths)
-
-        path.pop()
-        return all_paths
+            yield list(path)
+            return
+        on_path = set(path)
+        stack = [iter(self.adjacency_list.get(u, []))]
+        while stack:
+            for neighbor, *_ in stack[-1]:
+                if neighbor in on_path:
+                    continue
+                if neighbor == v:
+                    yield path + [v]
+                    continue
+                path.append(neighbor)
+                on_path.add(neighbor)
+                stack.append(iter(self.adjacency_list.get(neighbor, [])))
+                break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
 
     # Задание 5: Нахождение центра графа (эксцентриситеты и радиус графа)
     def bfs_eccentricity(self, start):
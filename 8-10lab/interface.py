@@ -151,12 +151,14 @@ def console_interface():
         elif choice == '13':
             start = input("Введите начальную вершину: ").strip()
             end = input("Введите конечную вершину: ").strip()
-            paths = graph.dfs_all_paths(start, end)
-            if paths:
-                print(f"Все пути из {start} в {end}:")
-                for path in paths:
-                    print(f"Путь: {' -> '.join(path)}")
-            else:
+            # Пути выводятся по мере нахождения, без накопления всего списка
+            found = False
+            for path in graph.iter_all_paths(start, end):
+                if not found:
+                    print(f"Все пути из {start} в {end}:")
+                    found = True
+                print(f"Путь: {' -> '.join(path)}")
+            if not found:
                 print(f"Пути из {start} в {end} не найдены.")
 
         elif choice == '14':
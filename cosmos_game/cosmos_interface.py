@@ -345,17 +345,17 @@ class SpaceExpeditionApp(tk.Tk):
             return
 
         try:
-            if not nx.has_path(self.graph, start_vertex, end_vertex):
+            # Один поиск от start до end: networkx останавливает Дейкстру, как только end достигнута,
+            # и возвращает сразу стоимость и путь
+            try:
+                fuel_cost, path = nx.single_source_dijkstra(self.graph, start_vertex, target=end_vertex,
+                                                            weight='weight')
+            except nx.NetworkXNoPath:
                 result_text = f"Путь от {start_vertex} до {end_vertex} недостижим."
                 self.result_label.config(text=result_text)
                 self.update_graph()
                 return
 
-            # Используем функцию из networkx для нахождения кратчайшего пути и стоимости
-            distances, predecessors = nx.single_source_dijkstra(self.graph, start_vertex)
-            path = nx.shortest_path(self.graph, source=start_vertex, target=end_vertex, weight='weight')
-            fuel_cost = nx.shortest_path_length(self.graph, source=start_vertex, target=end_vertex, weight='weight')
-
             result_text = f"Кратчайший путь от {start_vertex} до {end_vertex}: {' -> '.join(map(str, path))}\n" \
                           f"Общий расход топлива: {fuel_cost}"
             self.result_label.config(text=result_text)
@@ -377,20 +377,15 @@ class SpaceExpeditionApp(tk.Tk):
         # Шаг 1: Определяем главную компоненту
         main_component, isolated_edges = graph.identify_main_component()
 
-        # Шаг 2: Создаём подграф для главной компоненты
-        subgraph = {vertex: [edge for edge in graph.adjacency_list[vertex] if edge[0] in main_component]
-                    for vertex in main_component}
-
-        # Шаг 3: Временно подменяем список смежности и находим центр
-        graph.adjacency_list = subgraph
-        center = graph.find_graph_center()
-        graph.adjacency_list = {**graph.adjacency_list, **subgraph}  # Восстанавливаем полный граф
+        # Шаг 2: Находим центр главной компоненты; обход ограничен её вершинами,
+        # поэтому подграф не строится и список смежности графа не подменяется
+        center = graph.find_graph_center(main_component)
 
         # Обновляем текст с результатом
         result_text = f"Центральная база (в главной компоненте): {', '.join(center)}"
         self.result_label.config(text=result_text)
 
-        # Шаг 4: Отрисовка графа с сохранением названий вершин и весов рёбер
+        # Шаг 3: Отрисовка графа с сохранением названий вершин и весов рёбер
         self.ax.clear()  # Очищаем ось перед новой отрисовкой
         self.ax.axis("off")  # Убираем прямоугольник вокруг графа
 
@@ -417,7 +412,7 @@ class SpaceExpeditionApp(tk.Tk):
         isolated_edges = [(u, v) for u, v, *_ in self.graph.edges if u not in main_component or v not in main_component]
         nx.draw_networkx_edges(self.graph, self.positions, edgelist=isolated_edges, edge_color="gray", width=2, ax=self.ax)
 
-        # Шаг 5: Перерисовка canvas
+        # Шаг 4: Перерисовка canvas
         self.canvas.draw()
 
     def minimum_spanning_tree_task(self):
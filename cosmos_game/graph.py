@@ -30,16 +30,15 @@ class Graph:
 
     def from_networkx(self, nx_graph):
         """Преобразует объект NetworkX в Graph."""
-        self.adjacency_list = {node: [] for node in nx_graph.nodes}
         self.directed = isinstance(nx_graph, nx.DiGraph)
         self.weighted = any('weight' in data for _, _, data in nx_graph.edges(data=True))
 
-        # Переносим рёбра и веса в adjacency_list
-        for u, v, data in nx_graph.edges(data=True):
-            weight = data.get('weight', None)
-            self.adjacency_list[u].append((v, weight))
-            if not self.directed:
-                self.adjacency_list[v].append((u, weight))
+        # Списки смежности берём целиком из структуры смежности NetworkX: для неориентированного
+        # графа она уже содержит оба направления каждого ребра
+        self.adjacency_list = {
+            u: [(v, data.get('weight', None)) for v, data in neighbors.items()]
+            for u, neighbors in nx_graph.adjacency()
+        }
 
     def load_from_file(self, filename):
         with open(filename, 'r') as file:
@@ -392,9 +391,11 @@ class Graph:
         return all_paths
 
     # Задание 5: Нахождение центра графа (эксцентриситеты и радиус графа)
-    def bfs_eccentricity(self, start):
-
-        distances = {vertex: float('inf') for vertex in self.adjacency_list}
+    def bfs_eccentricity(self, start, vertices=None):
+        # vertices ограничивает обход подграфом на этих вершинах (рёбра в другие вершины пропускаются)
+        if vertices is None:
+            vertices = self.adjacency_list
+        distances = {vertex: float('inf') for vertex in vertices}
         distances[start] = 0
 
         queue = deque([start])
@@ -404,15 +405,21 @@ class Graph:
             current_distance = distances[vertex]
 
             for neighbor, *_ in self.adjacency_list[vertex]:
-                if distances[neighbor] == float('inf'):
+                if distances.get(neighbor) == float('inf'):
                     distances[neighbor] = current_distance + 1
                     queue.append(neighbor)
 
         eccentricity = max(distances.values())
         return eccentricity
 
-    def find_graph_center(self):
-        eccentricities = {vertex: self.bfs_eccentricity(vertex) for vertex in self.adjacency_list}
+    def find_graph_center(self, vertices=None):
+        """
+        Центр графа или, если задано множество vertices, центр подграфа на этих вершинах:
+        обход просто не выходит за vertices, поэтому отдельный подграф строить не нужно.
+        """
+        if vertices is None:
+            vertices = self.adjacency_list
+        eccentricities = {vertex: self.bfs_eccentricity(vertex, vertices) for vertex in vertices}
         radius = min(eccentricities.values())
         center = [vertex for vertex, ecc in eccentricities.items() if ecc == radius]
 